@@ -1,7 +1,72 @@
-from django.apps import AppConfig
-from django.db.models import Field
+import os
+import sys
+import threading
+from django.apps import AppConfig, apps
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.utils.autoreload import DJANGO_AUTORELOAD_ENV
+
+MANAGEMENT_SCRIPTS = ('manage.py', 'django-admin', 'django-admin.py')
+
+
+def is_server_process(argv):
+    """
+    Whether the process running ``argv`` serves requests: an application
+    server, or the child process of ``runserver`` when it autoreloads. The
+    other management commands don't search, so they skip the warm-up.
+    """
+    script = argv[0] if argv else ''
+    if not (
+        os.path.basename(script) in MANAGEMENT_SCRIPTS
+        or script.endswith(os.path.join('django', '__main__.py'))
+    ):
+        return True
+    if len(argv) < 2 or argv[1] != 'runserver':
+        return False
+    return '--noreload' in argv or os.environ.get(DJANGO_AUTORELOAD_ENV) == 'true'
 
 
 class DjangoBm25Config(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'django_bm25'
+
+    def ready(self):
+        if getattr(settings, 'BM25_CACHE', None) is not None:
+            self.connect_cache_invalidation()
+        if getattr(settings, 'BM25_SEARCH_ROUTER', None) is not None:
+            self.connect_search_pinning()
+        if getattr(settings, 'BM25_WARMUP_ON_STARTUP', False) and is_server_process(sys.argv):
+            self.start_warmup()
+
+    def get_search_models(self):
+        from django_bm25.mixins import FullTextSearchMixin
+
+        return [
+            model for model in apps.get_models()
+            if issubclass(model, FullTextSearchMixin)
+        ]
+
+    def connect_cache_invalidation(self):
+        from django_bm25.cache import search_cache
+
+        for model in self.get_search_models():
+            search_cache.connect(model)
+
+    def connect_search_pinning(self):
+        from django_bm25.routers import pin_search_to_primary
+        from django_bm25.signals import post_bulk_write
+
+        for model in self.get_search_models():
+            for signal in (post_save, post_delete, post_bulk_write):
+                signal.connect(
+                    pin_search_to_primary,
+                    sender=model,
+                    dispatch_uid='django_bm25_router_%s' % model._meta.label_lower,
+                )
+
+    def start_warmup(self):
+        from django_bm25.warmup import warmup_in_background
+
+        # Don't hold the startup, the first searches are only slower until
+        # the warm-up is done.
+        threading.Thread(target=warmup_in_background, daemon=True).start()
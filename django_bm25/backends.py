@@ -0,0 +1,226 @@
+from django.db import NotSupportedError
+from django.db.backends.ddl_references import Statement, Table
+
+SQLITE_TOKENIZERS = {
+    'default': 'unicode61 remove_diacritics 0',
+    'whitespace': "unicode61 remove_diacritics 0 tokenchars '-_./@'",
+    'raw': "unicode61 remove_diacritics 0 tokenchars '-_./@'",
+    'en_stem': 'porter unicode61 remove_diacritics 0',
+    'ngram': 'trigram',
+}
+
+INTEGER_PK_TYPES = (
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField',
+    'SmallIntegerField', 'PositiveIntegerField', 'PositiveBigIntegerField',
+    'PositiveSmallIntegerField',
+)
+
+
+class Bm25Backend:
+    """
+    Database specific SQL of the BM25 expressions and of ``Bm25Index``.
+    """
+    vendor = None
+    # Whether fast field filters can be ANDed to the query string.
+    supports_query_pushdown = False
+    # Features built on PostgreSQL specific SQL.
+    supports_facets = False
+    supports_search_many = False
+    supports_hybrid_search = False
+    supports_planner_count = False
+    supports_index_stats = False
+    # Whether bulk_load() can stream rows with COPY.
+    supports_copy = False
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def check_supported(self, feature, description):
+        if not getattr(self, 'supports_%s' % feature):
+            raise NotSupportedError('%s is not supported on %s.' % (description, self.connection.vendor))
+
+    def match_sql(self, compiler, table, query_sql):
+        raise NotImplementedError
+
+    def join_matches(self, queryset, query):
+        """
+        Hook for backends that compute the matches of a search ``query``
+        once, in a join, rather than in ``match_sql()``/``score_sql()``.
+        """
+        return queryset
+
+    def score_sql(self, compiler, table, query_sql):
+        raise NotImplementedError
+
+    def create_index_sql(self, model, index, schema_editor, **kwargs):
+        raise NotImplementedError
+
+    def remove_index_sql(self, model, index, schema_editor, **kwargs):
+        raise NotImplementedError
+
+
+class PostgreSQLBackend(Bm25Backend):
+    """
+    ParadeDB ``pg_bm25``: a ``bm25`` index queried with ``@@@`` and ranked
+    with ``paradedb.rank_bm25()``.
+    """
+    vendor = 'postgresql'
+    supports_query_pushdown = True
+    supports_facets = True
+    supports_search_many = True
+    supports_hybrid_search = True
+    supports_planner_count = True
+    supports_index_stats = True
+    supports_copy = True
+
+    def match_sql(self, compiler, table, query_sql):
+        return '%s @@@ %s' % (table, query_sql)
+
+    def score_sql(self, compiler, table, query_sql):
+        return 'paradedb.rank_bm25(%s.ctid)' % table
+
+    def create_index_sql(self, model, index, schema_editor, **kwargs):
+        from django_bm25.indexes import Bm25Index
+
+        return super(Bm25Index, index).create_sql(model, schema_editor, **kwargs)
+
+    def remove_index_sql(self, model, index, schema_editor, **kwargs):
+        from django_bm25.indexes import Bm25Index
+
+        return super(Bm25Index, index).remove_sql(model, schema_editor, **kwargs)
+
+
+class SQLiteBackend(Bm25Backend):
+    """
+    SQLite FTS5 fallback: the index is an external content FTS5 table
+    named after it, kept in sync by triggers and ranked with ``bm25()``.
+    Queries use the FTS5 syntax, which shares ``field:term``, phrases and
+    ``AND``/``OR`` with ParadeDB.
+    """
+    vendor = 'sqlite'
+
+    def get_index(self, model):
+        from django_bm25.indexes import get_bm25_indexes
+
+        indexes = get_bm25_indexes(model)
+        if not indexes:
+            raise NotSupportedError('%s has no Bm25Index.' % model._meta.label)
+        return indexes[0]
+
+    def get_table_sql(self, compiler, query_sql):
+        index = self.get_index(compiler.query.model)
+        fts_table = self.connection.ops.quote_name(index.name)
+        return 'SELECT rowid FROM %s WHERE %s MATCH %s' % (fts_table, fts_table, query_sql)
+
+    def match_sql(self, compiler, table, query_sql):
+        pk = compiler.query.get_meta().pk.column
+        return '%s.%s IN (%s)' % (
+            table, self.connection.ops.quote_name(pk), self.get_table_sql(compiler, query_sql)
+        )
+
+    def join_matches(self, queryset, query):
+        from django_bm25.expressions import Bm25MatchJoin
+
+        index = self.get_index(queryset.model)
+        sql_query = queryset.query
+        join = Bm25MatchJoin(
+            index.name, sql_query.get_initial_alias(), None, query, queryset.model._meta.pk.column
+        )
+        join.table_alias, _ = sql_query.table_alias(join.table_name, create=True)
+        sql_query.alias_map[join.table_alias] = join
+        return queryset
+
+    def score_sql(self, compiler, table, query_sql):
+        # Without a join_matches() join: bm25() is only available in the
+        # FTS5 query and lower is better.
+        index = self.get_index(compiler.query.model)
+        fts_table = self.connection.ops.quote_name(index.name)
+        pk = compiler.query.get_meta().pk.column
+        return '(SELECT -bm25(%s) FROM %s WHERE %s MATCH %s AND rowid = %s.%s)' % (
+            fts_table, fts_table, fts_table, query_sql, table, self.connection.ops.quote_name(pk)
+        )
+
+    def get_tokenizer(self, index):
+        tokenizers = set()
+        for config in index.text_fields.values():
+            tokenizer = config.get('tokenizer', 'default')
+            if isinstance(tokenizer, dict):
+                tokenizer = tokenizer.get('type', 'default')
+            tokenizers.add(tokenizer)
+        if len(tokenizers) > 1:
+            raise NotSupportedError('FTS5 tables have a single tokenizer, got %s.' % ', '.join(sorted(tokenizers)))
+        tokenizer = tokenizers.pop() if tokenizers else 'default'
+        if tokenizer not in SQLITE_TOKENIZERS:
+            raise NotSupportedError('Tokenizer %s is not supported on SQLite.' % tokenizer)
+        return SQLITE_TOKENIZERS[tokenizer]
+
+    def create_index_sql(self, model, index, schema_editor, **kwargs):
+        """
+        Return the statement creating the insert trigger and defer the FTS5
+        table, the other triggers and the initial ``rebuild``: SQLite runs
+        one statement at a time, triggers may be created before the table
+        they write to, and the deferred statements run after the model's
+        table is created.
+
+        The statements reference the model's table through ``Table`` parts,
+        so that rebuilding the table (``_remake_table()``, e.g. to add a
+        field) renames them along with it.
+        """
+        if model._meta.pk.get_internal_type() not in INTEGER_PK_TYPES:
+            raise NotSupportedError('FTS5 indexes require an integer primary key.')
+        if not index.text_fields:
+            raise NotSupportedError('FTS5 indexes require text fields.')
+        quote_name = schema_editor.quote_name
+        fts_table = quote_name(index.name)
+        table = Table(model._meta.db_table, quote_name)
+        pk = quote_name(model._meta.pk.column)
+        columns = [quote_name(model._meta.get_field(name).column) for name in index.text_fields]
+        new_values = ', '.join('new.%s' % column for column in columns)
+        old_values = ', '.join('old.%s' % column for column in columns)
+        insert = 'INSERT INTO %s(rowid, %s) VALUES (new.%s, %s);' % (
+            fts_table, ', '.join(columns), pk, new_values
+        )
+        delete = "INSERT INTO %s(%s, rowid, %s) VALUES ('delete', old.%s, %s);" % (
+            fts_table, fts_table, ', '.join(columns), pk, old_values
+        )
+
+        def trigger(suffix, event, body):
+            return Statement(
+                'CREATE TRIGGER %(name)s AFTER %(event)s ON %(table)s BEGIN %(body)s END',
+                name=quote_name('%s_%s' % (index.name, suffix)), event=event, table=table, body=body,
+            )
+
+        schema_editor.deferred_sql.extend([
+            Statement('DROP TABLE IF EXISTS %(name)s', name=fts_table),
+            Statement(
+                'CREATE VIRTUAL TABLE %(name)s USING fts5(%(columns)s, content=%(table)s, '
+                'content_rowid=%(pk)s, tokenize="%(tokenizer)s")',
+                name=fts_table, columns=', '.join(columns), table=table, pk=pk,
+                tokenizer=self.get_tokenizer(index),
+            ),
+            trigger('ad', 'DELETE', delete),
+            trigger('au', 'UPDATE', delete + ' ' + insert),
+            Statement("INSERT INTO %(name)s(%(name)s) VALUES ('rebuild')", name=fts_table),
+        ])
+        return trigger('ai', 'INSERT', insert)
+
+    def remove_index_sql(self, model, index, schema_editor, **kwargs):
+        quote_name = schema_editor.quote_name
+        schema_editor.deferred_sql.extend([
+            Statement('DROP TRIGGER IF EXISTS %(name)s', name=quote_name('%s_%s' % (index.name, suffix)))
+            for suffix in ('ai', 'ad', 'au')
+        ])
+        return Statement('DROP TABLE IF EXISTS %(name)s', name=quote_name(index.name))
+
+
+BACKENDS = {
+    backend.vendor: backend
+    for backend in (PostgreSQLBackend, SQLiteBackend)
+}
+
+
+def get_backend(connection):
+    backend = BACKENDS.get(connection.vendor)
+    if backend is None:
+        raise NotSupportedError('BM25 search is not supported on %s.' % connection.vendor)
+    return backend(connection)
@@ -0,0 +1,440 @@
+import bisect
+import itertools
+import math
+import random
+import string
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections, router
+from django.db.models import F, Q
+from django.db.models.fields import AutoFieldMixin
+from django.db.models.functions import Upper
+from django_bm25.indexes import Bm25Index, get_bm25_indexes
+
+
+STRING_FIELD_TYPES = ('CharField', 'SlugField', 'TextField')
+INTEGER_FIELD_TYPES = (
+    'IntegerField', 'BigIntegerField', 'SmallIntegerField', 'PositiveIntegerField',
+    'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+)
+
+
+class SyntheticCorpus:
+    """
+    Vocabulary of pseudo words drawn with a Zipf-like skew: the word of
+    rank ``r`` has a weight of ``1 / r ** skew``.
+    """
+
+    def __init__(self, vocabulary_size=5000, skew=1.1, min_length=3, max_length=12, seed=None, words=None):
+        self.random = random.Random(seed)
+        self.min_length = min_length
+        self.max_length = max_length
+        if words is None:
+            words = self._generate_words(vocabulary_size)
+        self.words = list(words)
+        self.weights = list(itertools.accumulate(
+            1 / (rank ** skew) for rank in range(1, len(self.words) + 1)
+        ))
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_queryset(cls, queryset, field, sample=1000, seed=None):
+        """
+        Build the vocabulary from the words of an existing table, ranked by
+        frequency, so that queries match real data.
+        """
+        counter = Counter()
+        for text in queryset.values_list(field, flat=True)[:sample]:
+            counter.update(word.lower() for word in str(text).split())
+        words = [word for word, count in counter.most_common()]
+        return cls(skew=1.0, seed=seed, words=words)
+
+    def _generate_words(self, size):
+        words = set()
+        while len(words) < size:
+            length = self.random.randint(3, 10)
+            words.add(''.join(self.random.choice(string.ascii_lowercase) for i in range(length)))
+        return sorted(words)
+
+    def term(self):
+        with self.lock:
+            point = self.random.random() * self.weights[-1]
+        return self.words[bisect.bisect(self.weights, point)]
+
+    def terms(self, count):
+        return [self.term() for i in range(count)]
+
+    def document(self):
+        with self.lock:
+            length = self.random.randint(self.min_length, self.max_length)
+        return ' '.join(self.terms(length))
+
+    def records(self, count, field, **extra):
+        for i in range(count):
+            yield {field: self.document(), **extra}
+
+
+def get_generated_fields(model, field):
+    """
+    Return the fields of ``model``, other than the text ``field``, that
+    synthetic records have to fill: the unique fields and the non-null
+    fields without a default.
+    """
+    return [
+        model_field for model_field in model._meta.concrete_fields
+        if model_field.name != field and not isinstance(model_field, AutoFieldMixin) and (
+            model_field.unique or not model_field.null and model_field.get_default() is None
+        )
+    ]
+
+
+def synthetic_records(model, field, corpus, count, using=None):
+    """
+    Return an iterator of ``count`` records of ``model`` with a synthetic
+    document in ``field`` and, in the fields returned by
+    ``get_generated_fields()``, sequential values that are not in the table
+    yet. Raise ValueError when such a field can't be generated.
+    """
+    manager = model._default_manager.using(using)
+    generators = {}
+    for model_field in get_generated_fields(model, field):
+        internal_type = model_field.get_internal_type()
+        existing = set()
+        if model_field.unique:
+            existing = set(manager.values_list(model_field.attname, flat=True))
+        if internal_type in STRING_FIELD_TYPES:
+            convert = str
+            max_length = model_field.max_length
+            if max_length is not None and len(str(count + len(existing))) > max_length:
+                raise ValueError(
+                    'Cannot generate %d values for %s.%s in %d characters.'
+                    % (count, model._meta.label, model_field.name, max_length)
+                )
+        elif internal_type in INTEGER_FIELD_TYPES:
+            convert = int
+        else:
+            raise ValueError(
+                'Cannot generate values for %s.%s (%s).'
+                % (model._meta.label, model_field.name, internal_type)
+            )
+        generators[model_field.attname] = (
+            value for value in map(convert, itertools.count()) if value not in existing
+        )
+
+    def records():
+        for record in corpus.records(count, field):
+            for attname, values in generators.items():
+                record[attname] = next(values)
+            yield record
+
+    return records()
+
+
+class QueryMix:
+    def __init__(self, name, model, field, corpus, limit=20, filters=None, page=50, using=None):
+        self.name = name
+        self.model = model
+        self.field = field
+        self.corpus = corpus
+        self.limit = limit
+        self.filters = filters or {}
+        self.page = page
+        self.using = using
+
+    def scoped(self, term):
+        return '%s:%s' % (self.field, term)
+
+    def search(self, query, **kwargs):
+        return self.model.search(query, using=self.using, **kwargs)
+
+    def single_term(self):
+        return self.search(self.scoped(self.corpus.term()), top_k=self.limit).hits()
+
+    def multi_term(self):
+        query = ' OR '.join(self.scoped(term) for term in self.corpus.terms(3))
+        return self.search(query, top_k=self.limit).hits()
+
+    def phrase(self):
+        query = '%s:"%s"' % (self.field, ' '.join(self.corpus.terms(2)))
+        return self.search(query, top_k=self.limit).hits()
+
+    def filtered(self):
+        queryset = self.search(self.scoped(self.corpus.term())).filter(**self.filters)
+        return list(queryset.order_by('-score').values_list('pk', 'score')[:self.limit])
+
+    def top_k(self):
+        return list(self.search(self.scoped(self.corpus.term()), top_k=self.limit))
+
+    def deep_page(self):
+        offset = self.page * self.limit
+        queryset = self.search(self.scoped(self.corpus.term())).order_by('-score')
+        return list(queryset[offset:offset + self.limit])
+
+    def __call__(self):
+        return getattr(self, self.name)()
+
+
+QUERY_MIXES = ['single_term', 'multi_term', 'phrase', 'filtered', 'top_k', 'deep_page']
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, math.ceil(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+def summarize(latencies, seconds):
+    return {
+        'queries': len(latencies),
+        'mean_ms': 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+        'p50_ms': 1000 * percentile(latencies, 50),
+        'p95_ms': 1000 * percentile(latencies, 95),
+        'p99_ms': 1000 * percentile(latencies, 99),
+        'qps': len(latencies) / seconds if seconds else 0.0,
+    }
+
+
+def _worker(run, count, using):
+    latencies = []
+    errors = 0
+    try:
+        for i in range(count):
+            started = time.perf_counter()
+            try:
+                run()
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+    finally:
+        connections[using].close()
+    return latencies, errors
+
+
+def run_mix(run, queries, concurrency, using='default', warmup=0):
+    """
+    Run ``queries`` calls of ``run`` spread over ``concurrency`` threads,
+    each with its own connection, and summarize latency and throughput.
+    """
+    for i in range(warmup):
+        run()
+    per_thread = [queries // concurrency + (1 if i < queries % concurrency else 0) for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda count: _worker(run, count, using), per_thread))
+    seconds = time.perf_counter() - started
+    latencies = [latency for thread_latencies, errors in results for latency in thread_latencies]
+    summary = summarize(latencies, seconds)
+    summary['errors'] = sum(errors for thread_latencies, errors in results)
+    return summary
+
+
+def run_benchmark(model, field, corpus, mixes=QUERY_MIXES, concurrency=(1,), queries=100, warmup=5, using='default', progress=None, **mix_options):
+    runs = []
+    for name in mixes:
+        mix = QueryMix(name, model, field, corpus, using=using, **mix_options)
+        for level in concurrency:
+            summary = run_mix(mix, queries, level, using=using, warmup=warmup)
+            summary.update({'mix': name, 'concurrency': level})
+            runs.append(summary)
+            if progress is not None:
+                progress(summary)
+    return {
+        'model': model._meta.label,
+        'field': field,
+        'documents': model._default_manager.using(using).count(),
+        'runs': runs,
+    }
+
+
+class Baseline:
+    """
+    A way of indexing and querying ``field`` compared by ``compare()``.
+    ``query`` receives a list of terms and returns the top ``limit`` hits
+    matching any of them.
+    """
+    name = None
+
+    def __init__(self, model, field, limit=20, using=None):
+        self.model = model
+        self.field = field
+        self.limit = limit
+        self.using = using
+
+    def get_queryset(self):
+        return self.model._default_manager.using(self.using)
+
+    def get_index(self):
+        raise NotImplementedError
+
+    def query(self, terms):
+        raise NotImplementedError
+
+
+class Bm25Baseline(Baseline):
+    name = 'bm25'
+
+    def get_index(self):
+        return Bm25Index(name='bench_bm25_idx', text_fields=[self.field])
+
+    def query(self, terms):
+        query = ' OR '.join('%s:%s' % (self.field, term) for term in terms)
+        return self.model.search(query, top_k=self.limit, using=self.using).hits()
+
+
+class TsvectorBaseline(Baseline):
+    name = 'tsvector'
+
+    def get_vector(self):
+        return SearchVector(self.field, config='simple')
+
+    def get_index(self):
+        return GinIndex(self.get_vector(), name='bench_tsvector_idx')
+
+    def query(self, terms):
+        query = SearchQuery(terms[0], config='simple')
+        for term in terms[1:]:
+            query = query | SearchQuery(term, config='simple')
+        queryset = (
+            self.get_queryset()
+            .annotate(search=self.get_vector())
+            .filter(search=query)
+            .annotate(rank=SearchRank(F('search'), query))
+            .order_by('-rank')
+        )
+        return list(queryset.values_list('pk', 'rank')[:self.limit])
+
+
+class TrigramBaseline(Baseline):
+    name = 'trigram'
+
+    def get_index(self):
+        # Matches the UPPER(...) LIKE UPPER(...) produced by icontains.
+        return GinIndex(OpClass(Upper(self.field), name='gin_trgm_ops'), name='bench_trigram_idx')
+
+    def query(self, terms):
+        condition = Q()
+        for term in terms:
+            condition |= Q(**{'%s__icontains' % self.field: term})
+        return list(self.get_queryset().filter(condition).values_list('pk', flat=True)[:self.limit])
+
+
+BASELINES = [Bm25Baseline, TsvectorBaseline, TrigramBaseline]
+
+
+def get_index_size(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_catalog.pg_relation_size(%s::regclass)", [connection.ops.quote_name(name)])
+        return cursor.fetchone()[0]
+
+
+def get_wal_lsn(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_catalog.pg_current_wal_insert_lsn()")
+        return cursor.fetchone()[0]
+
+
+def measure_writes(model, field, corpus, rows, using):
+    """
+    Insert ``rows`` documents, then delete them, and return the seconds
+    spent inserting and the WAL bytes written by the inserts.
+    """
+    connection = connections[using]
+    manager = model._default_manager.db_manager(using)
+    objs = [model(**record) for record in synthetic_records(model, field, corpus, rows, using)]
+    start_lsn = get_wal_lsn(connection)
+    started = time.perf_counter()
+    objs = manager.bulk_create(objs, batch_size=100)
+    seconds = time.perf_counter() - started
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_catalog.pg_wal_lsn_diff(pg_catalog.pg_current_wal_insert_lsn(), %s)",
+            [start_lsn],
+        )
+        wal_bytes = int(cursor.fetchone()[0])
+    manager.filter(pk__in=[obj.pk for obj in objs]).delete()
+    return seconds, wal_bytes
+
+
+def compare(model, field, corpus, baselines=BASELINES, concurrency=(1,), queries=100, write_rows=1000, limit=20, using=None, progress=None):
+    """
+    Build each baseline index on the model table in turn and report its
+    build time, on-disk size, query latency for single and multi-term
+    queries and the write amplification of inserts relative to no index.
+    The model's own Bm25Index are dropped during the comparison and built
+    again afterwards.
+    """
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    live_indexes = get_bm25_indexes(model)
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with connection.schema_editor() as editor:
+        for index in live_indexes:
+            editor.remove_index(model, index)
+
+    results = []
+    try:
+        write_seconds, baseline_wal = measure_writes(model, field, corpus, write_rows, using)
+        results.append({
+            'name': 'none',
+            'build_seconds': 0.0,
+            'size_bytes': 0,
+            'queries': [],
+            'write_seconds': write_seconds,
+            'wal_bytes': baseline_wal,
+            'write_amplification': 1.0,
+        })
+        if progress is not None:
+            progress(results[0])
+
+        for baseline_class in baselines:
+            baseline = baseline_class(model, field, limit=limit, using=using)
+            index = baseline.get_index()
+            started = time.perf_counter()
+            with connection.schema_editor() as editor:
+                editor.add_index(model, index)
+            result = {
+                'name': baseline.name,
+                'build_seconds': time.perf_counter() - started,
+                'size_bytes': get_index_size(connection, index.name),
+                'queries': [],
+            }
+            try:
+                for mix, count in (('single_term', 1), ('multi_term', 3)):
+                    def run(count=count):
+                        return baseline.query(corpus.terms(count))
+                    for level in concurrency:
+                        summary = run_mix(run, queries, level, using=using)
+                        summary.update({'mix': mix, 'concurrency': level})
+                        result['queries'].append(summary)
+                write_seconds, wal_bytes = measure_writes(model, field, corpus, write_rows, using)
+            finally:
+                with connection.schema_editor() as editor:
+                    editor.remove_index(model, index)
+            result.update({
+                'write_seconds': write_seconds,
+                'wal_bytes': wal_bytes,
+                'write_amplification': wal_bytes / baseline_wal if baseline_wal else 0.0,
+            })
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    finally:
+        with connection.schema_editor() as editor:
+            for index in live_indexes:
+                editor.add_index(model, index)
+
+    return {
+        'model': model._meta.label,
+        'field': field,
+        'documents': model._default_manager.using(using).count(),
+        'write_rows': write_rows,
+        'baselines': results,
+    }
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django_bm25.signals import post_bulk_write
+
+logger = logging.getLogger('django_bm25.cache')
+
+DEFAULT_ALIAS = 'default'
+DEFAULT_TIMEOUT = 300
+DEFAULT_KEY_PREFIX = 'bm25'
+
+_missing = object()
+
+
+class SearchCache:
+    """
+    Cache of search hits keyed by model, SQL (normalized query string,
+    filters and page) and a per-model generation counter. Writes bump the
+    generation, so entries for older generations are never read again and
+    are left to the cache backend's TTL/LRU eviction (e.g. ``LocMemCache``
+    with ``MAX_ENTRIES``).
+
+    Configured through the ``BM25_CACHE`` setting::
+
+        BM25_CACHE = {'ALIAS': 'default', 'TIMEOUT': 300}
+    """
+
+    def __init__(self, alias=None, timeout=None, key_prefix=None):
+        self._alias = alias
+        self._timeout = timeout
+        self._key_prefix = key_prefix
+        self._stats = Counter()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._connected = set()
+
+    def get_setting(self, name, default):
+        return getattr(settings, 'BM25_CACHE', {}).get(name, default)
+
+    @property
+    def alias(self):
+        return self._alias or self.get_setting('ALIAS', DEFAULT_ALIAS)
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return self.get_setting('TIMEOUT', DEFAULT_TIMEOUT)
+
+    @property
+    def key_prefix(self):
+        return self._key_prefix or self.get_setting('KEY_PREFIX', DEFAULT_KEY_PREFIX)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_generation_key(self, model):
+        return '%s:generation:%s' % (self.key_prefix, model._meta.label_lower)
+
+    def connect(self, model):
+        """
+        Invalidate the entries of ``model`` on its writes. Done on first use
+        of the cache for a model, and for every search model on startup when
+        ``BM25_CACHE`` is set.
+        """
+        if model in self._connected:
+            return
+        uid = 'django_bm25_cache_%s_%s' % (id(self), model._meta.label_lower)
+        for signal in (post_save, post_delete, post_bulk_write):
+            signal.connect(self.handle_write, sender=model, dispatch_uid=uid)
+        self._connected.add(model)
+
+    def handle_write(self, sender, using=None, **kwargs):
+        self.invalidate(sender)
+        # A search running before the commit can still read the old rows
+        # and cache them under the new generation, bump it again once the
+        # write is visible.
+        transaction.on_commit(lambda: self.invalidate(sender), using=using)
+
+    def get_generation(self, model):
+        self.connect(model)
+        key = self.get_generation_key(model)
+        generation = self.cache.get(key)
+        if generation is None:
+            # Start from the current time rather than 0, so that losing the
+            # counter to eviction can't bring back an older generation.
+            self.cache.add(key, int(time.time() * 1000), timeout=None)
+            generation = self.cache.get(key)
+        return generation
+
+    def invalidate(self, model):
+        key = self.get_generation_key(model)
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, int(time.time() * 1000), timeout=None)
+
+    def get_key(self, queryset, kind='hits'):
+        sql, params = queryset.query.get_compiler(using=queryset.db).as_sql()
+        data = json.dumps([queryset.db, sql, params], default=str)
+        return '%s:%s:%s:%s:%s' % (
+            self.key_prefix,
+            kind,
+            queryset.model._meta.label_lower,
+            self.get_generation(queryset.model),
+            hashlib.sha1(data.encode()).hexdigest(),
+        )
+
+    def get_or_set(self, queryset, fetch):
+        key = self.get_key(queryset)
+        label = queryset.model._meta.label_lower
+        value = self.cache.get(key, _missing)
+        if value is not _missing:
+            self._count(label, 'hits')
+            return value
+        self._count(label, 'misses')
+        value = fetch()
+        self.cache.set(key, value, self.timeout)
+        return value
+
+    def get_or_refresh(self, queryset, fetch, fallback, max_age, kind='hits'):
+        """
+        Return the cached result of ``fetch`` without waiting for it: a
+        missing entry returns ``fallback()`` and an entry older than
+        ``max_age`` seconds is returned as is, in both cases while ``fetch``
+        runs in a background thread to fill the cache. Return a
+        ``(value, cached)`` tuple.
+        """
+        key = self.get_key(queryset, kind)
+        label = queryset.model._meta.label_lower
+        entry = self.cache.get(key)
+        if entry is None:
+            self._count(label, 'misses')
+            self.refresh(key, queryset.db, fetch)
+            return fallback(), False
+        self._count(label, 'hits')
+        value, updated = entry
+        if time.time() - updated > max_age:
+            self.refresh(key, queryset.db, fetch)
+        return value, True
+
+    def refresh(self, key, using, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        thread = threading.Thread(
+            target=self._refresh, args=(key, using, fetch), name='bm25-cache-refresh', daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _refresh(self, key, using, fetch):
+        try:
+            self.cache.set(key, (fetch(), time.time()), self.timeout)
+        except Exception:
+            logger.exception('Refreshing %s failed', key)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+            connections[using].close()
+
+    def _count(self, label, name):
+        with self._lock:
+            self._stats[(label, name)] += 1
+
+    def stats(self, model=None):
+        with self._lock:
+            stats = dict(self._stats)
+        label = model._meta.label_lower if model is not None else None
+        hits = misses = 0
+        for (model_label, name), value in stats.items():
+            if label is not None and model_label != label:
+                continue
+            if name == 'hits':
+                hits += value
+            else:
+                misses += value
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else 0.0,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+search_cache = SearchCache()
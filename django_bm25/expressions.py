@@ -1,4 +1,41 @@
-from django.db.models.expressions import Expression
+from django.db import NotSupportedError
+from django.db.models import BooleanField, F, FloatField
+from django.db.models.expressions import Expression, Value
+from django.db.models.sql.constants import LOUTER
+from django.db.models.sql.datastructures import BaseTable
+from django.db.models.sql.where import WhereNode
+from django_bm25.backends import get_backend
+
+HYBRID_SCORE_COLUMN = 'bm25_hybrid_score'
+
+
+def _base_table(compiler):
+    query = compiler.query
+    alias = query.base_table or query.get_initial_alias()
+    return compiler.quote_name_unless_alias(alias)
+
+
+def _find_match(node):
+    if isinstance(node, Bm25Match):
+        return node
+    if isinstance(node, WhereNode):
+        children = node.children
+    else:
+        children = getattr(node, 'get_source_expressions', list)()
+    for child in children:
+        match = _find_match(child)
+        if match is not None:
+            return match
+    return None
+
+
+def _find_match_join(query, match=None):
+    for alias, table in query.alias_map.items():
+        if (isinstance(table, Bm25MatchJoin) and query.alias_refcount[alias]
+                and (match is None or match.query == table.query)):
+            return table
+    return None
+
 
 class TableStar(Expression):
     def __repr__(self):
@@ -7,3 +44,212 @@ class TableStar(Expression):
     def as_sql(self, compiler, connection):
         db_table = compiler.query.get_meta().db_table
         return "%s.*" % db_table, []
+
+
+class Bm25Match(Expression):
+    """
+    Boolean expression matching the rows of the queryset table against a
+    ParadeDB query string through the ``@@@`` operator. The query may also
+    be an expression, e.g. a column of a ``LATERAL`` joined relation.
+    """
+    output_field = BooleanField()
+
+    def __init__(self, query):
+        super().__init__()
+        self.query = query
+        if not hasattr(query, 'resolve_expression'):
+            query = Value(query)
+        self.source_expressions = [query]
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.query)
+
+    def get_source_expressions(self):
+        return self.source_expressions
+
+    def set_source_expressions(self, exprs):
+        self.source_expressions = exprs
+
+    def as_sql(self, compiler, connection):
+        join = _find_match_join(compiler.query, self)
+        if join is not None:
+            return join.match_sql(compiler), []
+        query_sql, query_params = compiler.compile(self.source_expressions[0])
+        backend = get_backend(connection)
+        return backend.match_sql(compiler, _base_table(compiler), query_sql), query_params
+
+
+class Bm25Score(Expression):
+    """
+    BM25 relevance of the current row. Only meaningful on querysets that
+    are filtered by a ``Bm25Match``.
+    """
+    output_field = FloatField()
+
+    def __repr__(self):
+        return "%s()" % self.__class__.__name__
+
+    def as_sql(self, compiler, connection):
+        backend = get_backend(connection)
+        if backend.vendor == 'postgresql':
+            return backend.score_sql(compiler, _base_table(compiler), None), []
+        join = _find_match_join(compiler.query)
+        if join is not None:
+            return join.score_sql(compiler), []
+        # Other backends rank within the match, so score against the query
+        # the queryset is filtered by.
+        match = _find_match(compiler.query.where)
+        if match is None:
+            raise NotSupportedError('Bm25Score requires a Bm25Match filter on %s.' % connection.vendor)
+        query_sql, query_params = compiler.compile(match.source_expressions[0])
+        return backend.score_sql(compiler, _base_table(compiler), query_sql), query_params
+
+
+class Bm25SearchAfter(Expression):
+    """
+    Keyset condition ``(score, pk) < (last_score, last_pk)`` used to
+    continue a ``-score, -pk`` ordered search after a given hit.
+    """
+    output_field = BooleanField()
+
+    def __init__(self, score: float, pk):
+        super().__init__()
+        self.score = score
+        self.pk = pk
+        self.source_expressions = [Bm25Score(), F('pk')]
+
+    def __repr__(self):
+        return "%s(%r, %r)" % (self.__class__.__name__, self.score, self.pk)
+
+    def get_source_expressions(self):
+        return self.source_expressions
+
+    def set_source_expressions(self, exprs):
+        self.source_expressions = exprs
+
+    def resolve_expression(self, query=None, *args, **kwargs):
+        expression = super().resolve_expression(query, *args, **kwargs)
+        # On a queryset with window annotations (e.g. collapse_by), the
+        # condition filters the windowed rows, or the window would be
+        # computed over the rows after the cursor only.
+        expression.contains_over_clause = query is not None and any(
+            getattr(annotation, 'contains_over_clause', False)
+            for annotation in query.annotations.values()
+        )
+        return expression
+
+    def as_sql(self, compiler, connection):
+        score_sql, score_params = compiler.compile(self.source_expressions[0])
+        pk_sql, pk_params = compiler.compile(self.source_expressions[1])
+        pk_value = compiler.query.get_meta().pk.get_db_prep_value(self.pk, connection)
+        # rank_bm25() returns a real, compare against a real so that rows
+        # scoring exactly like the last hit are not skipped.
+        sql = "(%s, %s) < (CAST(%%s AS real), %%s)" % (score_sql, pk_sql)
+        return sql, (*score_params, *pk_params, self.score, pk_value)
+
+
+class DerivedTable(BaseTable):
+    """
+    Base table of a query replaced by a subquery that keeps the table's
+    alias, so that every column reference of the query still resolves.
+    """
+
+    def __init__(self, sql, params, table_name, alias):
+        super().__init__(table_name, alias)
+        self.sql = sql
+        self.params = tuple(params)
+
+    def as_sql(self, compiler, connection):
+        return "(%s) %s" % (self.sql, compiler.quote_name_unless_alias(self.table_alias)), self.params
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            self.sql, self.params, self.table_name, change_map.get(self.table_alias, self.table_alias)
+        )
+
+    @property
+    def identity(self):
+        return self.__class__, self.sql, self.params, self.table_name, self.table_alias
+
+
+class HybridScore(Expression):
+    """
+    Fused lexical and vector score of the current row, read from the
+    derived table built by ``FullTextSearchMixin.search_hybrid()``.
+    """
+    output_field = FloatField()
+
+    def __repr__(self):
+        return "%s()" % self.__class__.__name__
+
+    def as_sql(self, compiler, connection):
+        return "%s.%s" % (_base_table(compiler), HYBRID_SCORE_COLUMN), []
+
+
+class Bm25MatchJoin:
+    """
+    ``LEFT OUTER JOIN`` of the rowid and score of the FTS5 ``index_name``
+    matches of ``query`` on the queryset table, so that the FTS5 query runs
+    once. ``Bm25Match`` and ``Bm25Score`` on the same query read its
+    columns, a row matches when it joined a rowid.
+    """
+    join_type = LOUTER
+    nullable = True
+    filtered_relation = None
+
+    def __init__(self, index_name, parent_alias, table_alias, query, pk_column):
+        self.index_name = index_name
+        self.table_name = 'bm25_%s' % index_name
+        self.parent_alias = parent_alias
+        self.table_alias = table_alias
+        self.query = query
+        self.pk_column = pk_column
+
+    def as_sql(self, compiler, connection):
+        fts_table = connection.ops.quote_name(self.index_name)
+        alias = compiler.quote_name_unless_alias(self.table_alias)
+        sql = (
+            "%s (SELECT rowid AS bm25_rowid, -bm25(%s) AS bm25_score FROM %s WHERE %s MATCH %%s) %s "
+            "ON (%s.bm25_rowid = %s.%s)" % (
+                self.join_type, fts_table, fts_table, fts_table, alias,
+                alias, compiler.quote_name_unless_alias(self.parent_alias),
+                connection.ops.quote_name(self.pk_column),
+            )
+        )
+        return sql, [self.query]
+
+    def match_sql(self, compiler):
+        return '%s.bm25_rowid IS NOT NULL' % compiler.quote_name_unless_alias(self.table_alias)
+
+    def score_sql(self, compiler):
+        return '%s.bm25_score' % compiler.quote_name_unless_alias(self.table_alias)
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            self.index_name,
+            change_map.get(self.parent_alias, self.parent_alias),
+            change_map.get(self.table_alias, self.table_alias),
+            self.query,
+            self.pk_column,
+        )
+
+    def promote(self):
+        return self
+
+    def demote(self):
+        return self
+
+    @property
+    def identity(self):
+        return self.__class__, self.index_name, self.parent_alias, self.query
+
+    def __eq__(self, other):
+        if not isinstance(other, Bm25MatchJoin):
+            return NotImplemented
+        return self.identity == other.identity
+
+    def __hash__(self):
+        return hash(self.identity)
+
+    def equals(self, other):
+        return self == other
@@ -0,0 +1,85 @@
+from django.db import connections
+from django.db.models import F
+from django_bm25.routers import search_router
+
+FEDERATED_ALIAS = 'bm25_federated'
+
+# Scores are divided by the best score of the same model, so that models
+# with longer documents or larger vocabularies don't dominate the ranking.
+# The hit columns are aliased explicitly in federated_search_sql(): older
+# Django versions name the pk column after the field (e.g. "id"), not "pk".
+MODEL_HITS_SQL = (
+    '(SELECT CAST(%%s AS integer) AS position, CAST(hits.bm25_pk AS text) AS pk, '
+    'hits.bm25_score / NULLIF(MAX(hits.bm25_score) OVER (), 0) AS score '
+    'FROM (%s) AS hits)'
+)
+
+
+def federated_search_sql(models, query, top_k: int, per_model=None, using=None):
+    """
+    Build one statement with a ``UNION ALL`` of the top ``per_model`` BM25
+    hits of each model, returning the best ``top_k``
+    ``(position, pk, score)`` rows, where position is the model's index in
+    ``models``.
+    """
+    per_model = per_model or top_k
+    if using is None and models:
+        # Route once so that every model is searched on the same alias.
+        using = search_router.db_for_search(models[0])
+    parts = []
+    params = []
+    for position, model in enumerate(models):
+        inner = model.search(query, top_k=per_model, using=using).values(
+            bm25_pk=F('pk'), bm25_score=F('score')
+        )
+        if using is not None and inner.db != using:
+            raise ValueError('Federated search requires all models on the same database.')
+        using = inner.db
+        inner_sql, inner_params = inner.query.get_compiler(using=inner.db).as_sql()
+        parts.append(MODEL_HITS_SQL % inner_sql)
+        params += [position, *inner_params]
+
+    sql = (
+        'SELECT %(alias)s.position, %(alias)s.pk, %(alias)s.score '
+        'FROM (%(union)s) AS %(alias)s '
+        'ORDER BY %(alias)s.score DESC, %(alias)s.position, %(alias)s.pk LIMIT %%s'
+    ) % {'alias': FEDERATED_ALIAS, 'union': ' UNION ALL '.join(parts)}
+    return using, sql, (*params, top_k)
+
+
+def federated_search(models, query, top_k=10, per_model=None, hydrate=True, batch_size=None, using=None):
+    """
+    Search several ``FullTextSearchMixin`` models in a single round trip.
+    Return the globally ranked hits, as model instances (with the
+    normalized ``score`` set) or, when ``hydrate`` is false, as
+    ``(model, pk, score)`` tuples. Instances are loaded with one query per
+    model (or per ``batch_size`` hits).
+    """
+    models = list(models)
+    if not models:
+        return []
+
+    using, sql, params = federated_search_sql(models, query, top_k, per_model=per_model, using=using)
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    hits = [
+        (position, models[position]._meta.pk.to_python(pk), score)
+        for position, pk, score in rows
+    ]
+    if not hydrate:
+        return [(models[position], pk, score) for position, pk, score in hits]
+
+    objects = {}
+    for position, model in enumerate(models):
+        model_hits = [(pk, score) for hit_position, pk, score in hits if hit_position == position]
+        if not model_hits:
+            continue
+        queryset = model.get_search_queryset(using)
+        for obj in queryset.hydrate(model_hits, batch_size=batch_size):
+            objects[(position, obj.pk)] = obj
+    # Rows deleted since the search are skipped.
+    return [
+        objects[(position, pk)] for position, pk, score in hits if (position, pk) in objects
+    ]
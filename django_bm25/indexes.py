@@ -1,6 +1,9 @@
 import json
 from django.contrib.postgres.indexes import PostgresIndex
+from django.db import connections, router
+from django_bm25.backends import get_backend
 from django_bm25.expressions import TableStar
+from django_bm25.schema import get_index_stats
 
 TEXT_FIELD_CONFIGS = [
     'indexed',
@@ -109,6 +112,41 @@ class Bm25Index(PostgresIndex):
 
         return params
     
+    def create_sql(self, model, schema_editor, **kwargs):
+        return get_backend(schema_editor.connection).create_index_sql(
+            model, self, schema_editor, **kwargs
+        )
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        return get_backend(schema_editor.connection).remove_index_sql(
+            model, self, schema_editor, **kwargs
+        )
+
+    def get_fields_config(self):
+        fields = {}
+        for field_type in ['text', 'numeric', 'boolean', 'json']:
+            for field, config in getattr(self, '%s_fields' % field_type).items():
+                fields[field] = {'type': field_type, **config}
+        return fields
+
+    def stats(self, model, using=None):
+        """
+        Return the on-disk size, document count, configured fields, size
+        relative to the table and last build time of the index, or None if
+        it doesn't exist in the database.
+        """
+        using = using or router.db_for_read(model)
+        get_backend(connections[using]).check_supported('index_stats', 'Index statistics')
+        stats = get_index_stats(connections[using], self.name)
+        if stats is None:
+            return None
+        return {
+            'name': self.name,
+            'table': model._meta.db_table,
+            'fields': self.get_fields_config(),
+            **stats,
+        }
+
     def deconstruct(self):
         path, args, kwargs = super().deconstruct()
         args = ()
@@ -118,3 +156,7 @@ class Bm25Index(PostgresIndex):
             kwargs[field] = getattr(self, field)
 
         return path, args, kwargs
+
+
+def get_bm25_indexes(model):
+    return [index for index in model._meta.indexes if isinstance(index, Bm25Index)]
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+from django_bm25.signals import search_executed
+
+logger = logging.getLogger('django_bm25.search')
+
+
+class SearchMetrics:
+    """
+    Process wide counters of the evaluated searches per model, exportable
+    in the Prometheus text format or through a prometheus_client registry.
+    """
+    COUNTERS = {
+        'searches_total': 'Number of evaluated BM25 searches.',
+        'rows_total': 'Number of rows returned by BM25 searches.',
+        'db_seconds_total': 'Time spent executing BM25 searches in the database.',
+        'hydration_seconds_total': 'Time spent building results of BM25 searches.',
+        'slow_searches_total': 'Number of BM25 searches over the slow query threshold.',
+    }
+
+    def __init__(self, namespace='django_bm25'):
+        self.namespace = namespace
+        self.lock = threading.Lock()
+        self.values = defaultdict(float)
+
+    def record(self, label, phase, rows, db_time, hydration_time, slow=False):
+        with self.lock:
+            if phase == 'search':
+                self.values[('searches_total', label)] += 1
+                self.values[('rows_total', label)] += rows
+            self.values[('db_seconds_total', label)] += db_time
+            self.values[('hydration_seconds_total', label)] += hydration_time
+            if slow:
+                self.values[('slow_searches_total', label)] += 1
+
+    def collect(self):
+        """
+        Return ``(name, documentation, {model: value})`` for each counter.
+        """
+        with self.lock:
+            values = dict(self.values)
+        samples = []
+        for name, documentation in self.COUNTERS.items():
+            samples.append((
+                '%s_%s' % (self.namespace, name),
+                documentation,
+                {label: value for (counter, label), value in values.items() if counter == name},
+            ))
+        return samples
+
+    def export_text(self):
+        lines = []
+        for name, documentation, values in self.collect():
+            lines.append('# HELP %s %s' % (name, documentation))
+            lines.append('# TYPE %s counter' % name)
+            for label, value in sorted(values.items()):
+                lines.append('%s{model="%s"} %s' % (name, label, repr(float(value))))
+        return '\n'.join(lines) + '\n'
+
+    def register(self, registry=None):
+        """
+        Expose the counters through a ``prometheus_client`` registry.
+        """
+        from prometheus_client import REGISTRY
+        from prometheus_client.core import CounterMetricFamily
+
+        metrics = self
+
+        class Collector:
+            def collect(self):
+                for name, documentation, values in metrics.collect():
+                    family = CounterMetricFamily(name[:-len('_total')], documentation, labels=['model'])
+                    for label, value in values.items():
+                        family.add_metric([label], value)
+                    yield family
+
+        collector = Collector()
+        (registry or REGISTRY).register(collector)
+        return collector
+
+    def reset(self):
+        with self.lock:
+            self.values.clear()
+
+
+search_metrics = SearchMetrics()
+
+
+def get_slow_query_threshold():
+    return getattr(settings, 'BM25_SLOW_QUERY_THRESHOLD', None)
+
+
+class SearchTiming:
+    def __init__(self):
+        self.db_time = 0.0
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+
+
+@contextmanager
+def instrument_search(queryset, phase='search'):
+    """
+    Time the evaluation of ``queryset``, split between the database and
+    building the results, then update ``search_metrics`` and send
+    ``search_executed``. Searches slower than ``BM25_SLOW_QUERY_THRESHOLD``
+    seconds in the database are captured with EXPLAIN (ANALYZE, BUFFERS).
+    Set ``timing.rows`` inside the block.
+    """
+    timing = SearchTiming()
+    started = time.perf_counter()
+    with connections[queryset.db].execute_wrapper(timing):
+        yield timing
+    total = time.perf_counter() - started
+    hydration_time = max(0.0, total - timing.db_time)
+
+    model = queryset.model
+    threshold = get_slow_query_threshold()
+    slow = threshold is not None and timing.db_time >= threshold
+    explain = None
+    if slow and phase == 'search':
+        try:
+            explain = queryset.explain(analyze=True, buffers=True)
+        except Exception:
+            logger.exception('Unable to explain slow search on %s', model._meta.label)
+        logger.warning(
+            'Slow search on %s (%.3fs): %r\n%s',
+            model._meta.label, timing.db_time, queryset._search_query, explain,
+        )
+
+    search_metrics.record(model._meta.label, phase, timing.rows, timing.db_time, hydration_time, slow)
+    if search_executed.has_listeners(model):
+        search_executed.send(
+            sender=model,
+            query=queryset._search_query,
+            phase=phase,
+            rows=timing.rows,
+            db_time=timing.db_time,
+            hydration_time=hydration_time,
+            sql=str(queryset.query),
+            explain=explain,
+        )
@@ -0,0 +1,172 @@
+import csv
+import io
+import json
+import time
+from itertools import islice
+from django.db import connections, router, transaction
+from django.db.models import QuerySet
+from django.db.models.fields import AutoFieldMixin
+from django_bm25.backends import get_backend
+from django_bm25.indexes import get_bm25_indexes
+from django_bm25.schema import record_build_time
+from django_bm25.signals import post_bulk_write
+
+DEFAULT_BATCH_SIZE = 10000
+
+COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+})
+
+
+def read_json_lines(file):
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def read_csv(file):
+    yield from csv.DictReader(file)
+
+
+def get_load_fields(model, field_names=None):
+    if field_names is None:
+        return [
+            field for field in model._meta.concrete_fields
+            if not isinstance(field, AutoFieldMixin)
+        ]
+    return [model._meta.get_field(name) for name in field_names]
+
+
+def get_record_value(field, record):
+    if field.attname in record:
+        return record[field.attname]
+    if field.name in record:
+        return record[field.name]
+    return field.get_default()
+
+
+def format_copy_value(field, value, connection):
+    if value is None:
+        return '\\N'
+    if field.get_internal_type() == 'JSONField':
+        value = json.dumps(value, cls=field.encoder)
+    else:
+        value = field.get_db_prep_save(field.to_python(value), connection)
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).translate(COPY_ESCAPES)
+
+
+def format_copy_rows(fields, records, connection):
+    buffer = io.StringIO()
+    rows = 0
+    for record in records:
+        if not isinstance(record, dict):
+            record = {field.attname: getattr(record, field.attname) for field in fields}
+        buffer.write('\t'.join(
+            format_copy_value(field, get_record_value(field, record), connection)
+            for field in fields
+        ))
+        buffer.write('\n')
+        rows += 1
+    buffer.seek(0)
+    return buffer, rows
+
+
+def copy_rows(cursor, sql, buffer):
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, 'copy_expert'):
+        # psycopg2
+        raw_cursor.copy_expert(sql, buffer)
+    else:
+        # psycopg 3
+        with raw_cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def build_instances(model, fields, records):
+    instances = []
+    for record in records:
+        if not isinstance(record, dict):
+            instances.append(record)
+            continue
+        instances.append(model(**{
+            field.attname: field.to_python(get_record_value(field, record))
+            for field in fields
+        }))
+    return instances
+
+
+def bulk_load(model, records, fields=None, batch_size=DEFAULT_BATCH_SIZE, drop_index=False, using=None, progress=None):
+    """
+    Stream ``records`` (dicts or model instances) into the model table with
+    ``COPY`` (``bulk_create()`` on databases without it), one transaction
+    per batch. With ``drop_index`` the model's ``Bm25Index`` are dropped
+    before the load and built once afterwards.
+    ``progress`` is called after each batch with the rows loaded so far and
+    the elapsed seconds.
+
+    Return a dict with the loaded ``rows``, ``seconds`` and
+    ``rows_per_second``.
+    """
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    backend = get_backend(connection)
+    fields = get_load_fields(model, fields)
+    quote_name = connection.ops.quote_name
+    sql = 'COPY %s (%s) FROM STDIN' % (
+        quote_name(model._meta.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+    )
+    indexes = get_bm25_indexes(model) if drop_index else []
+
+    if indexes:
+        with connection.schema_editor() as editor:
+            for index in indexes:
+                editor.remove_index(model, index)
+
+    started = time.monotonic()
+    loaded = 0
+    records = iter(records)
+    try:
+        while True:
+            batch = islice(records, batch_size)
+            with transaction.atomic(using=using):
+                if backend.supports_copy:
+                    buffer, rows = format_copy_rows(fields, batch, connection)
+                    if rows:
+                        with connection.cursor() as cursor:
+                            copy_rows(cursor, sql, buffer)
+                else:
+                    # A plain QuerySet, post_bulk_write is sent once below.
+                    rows = len(QuerySet(model, using=using).bulk_create(
+                        build_instances(model, fields, batch)
+                    ))
+            if not rows:
+                break
+            loaded += rows
+            if progress is not None:
+                progress(loaded, time.monotonic() - started)
+    finally:
+        if indexes:
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(model, index)
+            if backend.supports_index_stats:
+                for index in indexes:
+                    record_build_time(connection, index.name)
+        if loaded:
+            post_bulk_write.send(sender=model, using=using)
+
+    seconds = time.monotonic() - started
+    return {
+        'rows': loaded,
+        'seconds': seconds,
+        'rows_per_second': loaded / seconds if seconds else 0.0,
+    }
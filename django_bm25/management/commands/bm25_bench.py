@@ -0,0 +1,139 @@
+import json
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django_bm25.benchmark import (
+    BASELINES, QUERY_MIXES, SyntheticCorpus, compare, run_benchmark, synthetic_records,
+)
+from django_bm25.loading import bulk_load
+
+
+def int_list(value):
+    return [int(item) for item in value.split(',')]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark FullTextSearchMixin.search() latency and throughput on a model.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model label, e.g. ibge.City.')
+        parser.add_argument('field', help='Indexed text field the queries are scoped to.')
+        parser.add_argument(
+            '--generate',
+            type=int,
+            default=0,
+            help='Load this many synthetic documents before running the queries.',
+        )
+        parser.add_argument('--vocabulary', type=int, default=5000, help='Synthetic vocabulary size.')
+        parser.add_argument('--skew', type=float, default=1.1, help='Zipf skew of the synthetic vocabulary.')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--mix', action='append', choices=QUERY_MIXES, help='Query mixes to run, defaults to all.')
+        parser.add_argument('--queries', type=int, default=200, help='Queries per mix and concurrency level.')
+        parser.add_argument('--concurrency', type=int_list, default=[1, 4, 16], help='Comma separated levels.')
+        parser.add_argument('--limit', type=int, default=20, help='Hits per query.')
+        parser.add_argument('--page', type=int, default=50, help='Page number of the deep_page mix.')
+        parser.add_argument(
+            '--filter',
+            action='append',
+            default=[],
+            help='field=value filter for the filtered mix, may be repeated.',
+        )
+        parser.add_argument(
+            '--compare',
+            action='store_true',
+            help=(
+                'Compare Bm25Index with tsvector/GIN and trigram indexes on the same table. '
+                'The model BM25 indexes are dropped during the comparison and built again afterwards.'
+            ),
+        )
+        parser.add_argument(
+            '--baseline',
+            action='append',
+            choices=[baseline.name for baseline in BASELINES],
+            help='Indexes to compare, defaults to all.',
+        )
+        parser.add_argument('--write-rows', type=int, default=1000, help='Rows inserted to measure write cost.')
+        parser.add_argument('--json', help='Write the results as JSON to this file, - for stdout.')
+        parser.add_argument('--database', default='default')
+
+    def report(self, summary):
+        self.stdout.write(self.format_summary(summary))
+
+    def report_baseline(self, result):
+        self.stdout.write(
+            '%(name)-9s build=%(build_seconds)8.2fs size=%(size_bytes)12d bytes '
+            'writes=%(write_seconds)7.2fs wal=%(wal_bytes)12d bytes amplification=%(write_amplification)5.2fx' % result
+        )
+        for summary in result['queries']:
+            self.stdout.write('          ' + self.format_summary(summary))
+
+    def format_summary(self, summary):
+        return (
+            '%(mix)-12s c=%(concurrency)-3d p50=%(p50_ms)8.2fms p95=%(p95_ms)8.2fms '
+            'p99=%(p99_ms)8.2fms %(qps)9.1f q/s errors=%(errors)d' % summary
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+        if not hasattr(model, 'search'):
+            raise CommandError('%s does not use FullTextSearchMixin.' % model._meta.label)
+
+        field = options['field']
+        filters = dict(item.split('=', 1) for item in options['filter'])
+        mixes = options['mix'] or [mix for mix in QUERY_MIXES if mix != 'filtered' or filters]
+
+        if options['generate']:
+            corpus = SyntheticCorpus(
+                vocabulary_size=options['vocabulary'],
+                skew=options['skew'],
+                seed=options['seed'],
+            )
+            try:
+                records = synthetic_records(model, field, corpus, options['generate'], using=options['database'])
+            except ValueError as e:
+                raise CommandError(e)
+            result = bulk_load(model, records, drop_index=True, using=options['database'])
+            self.stdout.write('Loaded %(rows)d documents (%(rows_per_second).0f rows/sec)' % result)
+        else:
+            corpus = SyntheticCorpus.from_queryset(
+                model._default_manager.using(options['database']), field, seed=options['seed']
+            )
+            if not corpus.words:
+                raise CommandError('%s has no documents, use --generate.' % model._meta.label)
+
+        if options['compare']:
+            names = options['baseline']
+            results = compare(
+                model,
+                field,
+                corpus,
+                baselines=[baseline for baseline in BASELINES if not names or baseline.name in names],
+                concurrency=options['concurrency'],
+                queries=options['queries'],
+                write_rows=options['write_rows'],
+                limit=options['limit'],
+                using=options['database'],
+                progress=None if options['json'] == '-' else self.report_baseline,
+            )
+        else:
+            results = run_benchmark(
+                model,
+                field,
+                corpus,
+                mixes=mixes,
+                concurrency=options['concurrency'],
+                queries=options['queries'],
+                using=options['database'],
+                progress=None if options['json'] == '-' else self.report,
+                limit=options['limit'],
+                page=options['page'],
+                filters=filters,
+            )
+
+        if options['json'] == '-':
+            self.stdout.write(json.dumps(results, indent=2))
+        elif options['json']:
+            with open(options['json'], 'w') as file:
+                json.dump(results, file, indent=2)
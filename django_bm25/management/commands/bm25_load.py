@@ -0,0 +1,72 @@
+import sys
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import NotSupportedError
+from django_bm25.loading import DEFAULT_BATCH_SIZE, bulk_load, read_csv, read_json_lines
+
+READERS = {
+    'jsonl': read_json_lines,
+    'csv': read_csv,
+}
+
+
+class Command(BaseCommand):
+    help = 'Bulk load JSON lines or CSV records into a model table (using COPY on PostgreSQL).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model label, e.g. ibge.City.')
+        parser.add_argument('path', help='File to load, or - to read from stdin.')
+        parser.add_argument('--format', choices=READERS.keys(), help='Defaults to the file extension.')
+        parser.add_argument('--fields', help='Comma separated field names to load.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            '--drop-index',
+            action='store_true',
+            help='Drop the BM25 indexes before loading and build them once afterwards.',
+        )
+        parser.add_argument('--database', help='Database alias to load into.')
+
+    def get_format(self, options):
+        if options['format']:
+            return options['format']
+        path = options['path']
+        if path.endswith('.csv'):
+            return 'csv'
+        if path.endswith(('.jsonl', '.json', '.ndjson')):
+            return 'jsonl'
+        raise CommandError('Unable to infer the format of %s, use --format.' % path)
+
+    def report(self, rows, seconds):
+        rate = rows / seconds if seconds else 0
+        self.stdout.write('%d rows loaded (%.0f rows/sec)' % (rows, rate))
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+        reader = READERS[self.get_format(options)]
+        fields = options['fields'].split(',') if options['fields'] else None
+
+        file = sys.stdin if options['path'] == '-' else open(options['path'], newline='')
+        try:
+            result = bulk_load(
+                model,
+                reader(file),
+                fields=fields,
+                batch_size=options['batch_size'],
+                drop_index=options['drop_index'],
+                using=options['database'],
+                progress=self.report,
+            )
+        except NotSupportedError as e:
+            raise CommandError(e)
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            'Loaded %d rows in %.2fs (%.0f rows/sec)' % (
+                result['rows'], result['seconds'], result['rows_per_second']
+            )
+        ))
@@ -0,0 +1,40 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django_bm25.reindex import shadow_reindex_model
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the BM25 indexes of a model with their current configuration '
+        'next to the live ones and swap them in without downtime.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model label, e.g. ibge.City.')
+        parser.add_argument('--index', action='append', dest='indexes', help='Only rebuild this index.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between progress reports.')
+        parser.add_argument('--database', help='Database alias to reindex.')
+
+    def report(self, phase, done, total, elapsed):
+        if total:
+            self.stdout.write('%s: %d/%d (%.1f%%) %.1fs' % (phase, done, total, 100 * done / total, elapsed))
+        else:
+            self.stdout.write('%s: %.1fs' % (phase, elapsed))
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+
+        elapsed = shadow_reindex_model(
+            model,
+            names=options['indexes'],
+            using=options['database'],
+            progress=self.report,
+            interval=options['interval'],
+        )
+        if not elapsed:
+            raise CommandError('No BM25 index to rebuild on %s.' % model._meta.label)
+        for name, seconds in elapsed.items():
+            self.stdout.write(self.style.SUCCESS('Rebuilt %s in %.2fs' % (name, seconds)))
@@ -0,0 +1,49 @@
+import json
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import NotSupportedError
+from django_bm25.indexes import get_bm25_indexes
+
+
+class Command(BaseCommand):
+    help = 'Report size, document count and configuration of the BM25 indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help='Model labels, defaults to every model with a BM25 index.')
+        parser.add_argument('--json', action='store_true', help='Output the statistics as JSON.')
+        parser.add_argument('--database', help='Database alias to inspect.')
+
+    def get_models(self, labels):
+        if not labels:
+            return [model for model in apps.get_models() if get_bm25_indexes(model)]
+        try:
+            return [apps.get_model(label) for label in labels]
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+
+    def handle(self, *args, **options):
+        stats = []
+        for model in self.get_models(options['models']):
+            for index in get_bm25_indexes(model):
+                try:
+                    index_stats = index.stats(model, using=options['database'])
+                except NotSupportedError as e:
+                    raise CommandError(e)
+                if index_stats is None:
+                    self.stderr.write('%s: index %s does not exist.' % (model._meta.label, index.name))
+                    continue
+                stats.append({'model': model._meta.label, **index_stats})
+
+        if options['json']:
+            self.stdout.write(json.dumps(stats, indent=2, cls=DjangoJSONEncoder))
+            return
+
+        for item in stats:
+            self.stdout.write(
+                '%(model)s %(name)s: %(size_bytes)d bytes, %(documents)d documents, '
+                '%(size_ratio).2fx table size, %(scans)s scans, last built %(last_built)s' % item
+            )
+            for field, config in item['fields'].items():
+                options = ', '.join('%s=%s' % (key, value) for key, value in config.items() if key != 'type')
+                self.stdout.write('    %s (%s)%s' % (field, config['type'], ' ' + options if options else ''))
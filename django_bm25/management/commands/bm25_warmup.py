@@ -0,0 +1,46 @@
+import time
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django_bm25.warmup import DEFAULT_QUERY_COUNT, warmup_all
+
+
+class Command(BaseCommand):
+    help = 'Warm the BM25 indexes up with pg_prewarm or by replaying representative searches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help='Model labels, defaults to every model with a BM25 index.')
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=DEFAULT_QUERY_COUNT,
+            help='Searches replayed per index when pg_prewarm is not installed.',
+        )
+        parser.add_argument('--database', help='Database alias to warm up.')
+
+    def report(self, result):
+        if result['method'] == 'pg_prewarm':
+            detail = '%d blocks prewarmed' % result['blocks']
+        elif result['method'] == 'replay':
+            detail = '%d searches replayed' % result['queries']
+        else:
+            detail = 'skipped'
+        self.stdout.write('%s %s: %s in %.2fs' % (result['model'], result['index'], detail, result['seconds']))
+
+    def handle(self, *args, **options):
+        models = None
+        if options['models']:
+            try:
+                models = [apps.get_model(label) for label in options['models']]
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+
+        started = time.monotonic()
+        results = warmup_all(
+            models,
+            using=options['database'],
+            query_count=options['queries'],
+            progress=self.report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            'Warmed up %d indexes in %.2fs' % (len(results), time.monotonic() - started)
+        ))
@@ -0,0 +1,6 @@
+from django.db.models.manager import BaseManager
+from django_bm25.querysets import Bm25QuerySet
+
+
+class Bm25Manager(BaseManager.from_queryset(Bm25QuerySet)):
+    pass
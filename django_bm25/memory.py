@@ -0,0 +1,343 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+from array import array
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django_bm25.indexes import get_bm25_indexes
+from django_bm25.search import Boolean, Boost, InvalidQuery, Prefix, QueryNode, Term
+from django_bm25.signals import post_bulk_write
+
+# Tantivy's BM25 parameters.
+K1 = 1.2
+B = 0.75
+
+# Tantivy's default tokenizer drops tokens longer than this.
+MAX_TOKEN_LENGTH = 40
+MAX_PREFIX_EXPANSIONS = 50
+# Deleted documents are merged away once they are this fraction of the index.
+COMPACT_RATIO = 0.2
+
+WORD = re.compile(r'[^\W_]+')
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_tokenizer(config):
+    """
+    Return a function splitting a value into terms like the ParadeDB
+    tokenizer and normalizer of a text field ``config``.
+    """
+    tokenizer = config.get('tokenizer', 'default')
+    if isinstance(tokenizer, dict):
+        options = dict(tokenizer)
+        tokenizer = options.pop('type', 'default')
+    else:
+        options = {}
+    lowercase = config.get('normalizer') == 'lowercase'
+
+    if tokenizer == 'default':
+        def tokenize(value):
+            return [
+                token.lower() for token in WORD.findall(value)
+                if len(token.encode()) <= MAX_TOKEN_LENGTH
+            ]
+    elif tokenizer == 'whitespace':
+        def tokenize(value):
+            return [token.lower() if lowercase else token for token in value.split()]
+    elif tokenizer == 'raw':
+        def tokenize(value):
+            return [value.lower() if lowercase else value]
+    elif tokenizer == 'ngram':
+        min_gram = options.get('min_gram', 2)
+        max_gram = options.get('max_gram', 3)
+        prefix_only = options.get('prefix_only', False)
+
+        def tokenize(value):
+            value = value.lower() if lowercase else value
+            starts = [0] if prefix_only else range(len(value))
+            return [
+                value[start:start + size]
+                for start in starts
+                for size in range(min_gram, max_gram + 1)
+                if start + size <= len(value)
+            ]
+    else:
+        raise ValueError('Tokenizer %s is not supported by the in-memory engine.' % tokenizer)
+    return tokenize
+
+
+class FieldIndex:
+    """
+    Inverted index of one text field: per term, the document positions and
+    term frequencies in ``array`` columns, and the length of each document.
+    """
+
+    def __init__(self, tokenize):
+        self.tokenize = tokenize
+        self.postings = {}
+        self.terms = []
+        self.lengths = array('I')
+        self.total_length = 0
+
+    def add(self, position, value):
+        tokens = self.tokenize(value) if value else []
+        self.lengths.append(len(tokens))
+        self.total_length += len(tokens)
+        frequencies = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for token, frequency in frequencies.items():
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = (array('I'), array('I'))
+                bisect.insort(self.terms, token)
+            postings[0].append(position)
+            postings[1].append(frequency)
+
+    def compact(self, positions):
+        """
+        Keep the documents of ``positions``, mapping their old position to
+        the new one.
+        """
+        self.lengths = array('I', (
+            length for position, length in enumerate(self.lengths) if position in positions
+        ))
+        self.total_length = sum(self.lengths)
+        postings = {}
+        for term, (documents, frequencies) in self.postings.items():
+            kept = [
+                (positions[position], frequency)
+                for position, frequency in zip(documents, frequencies) if position in positions
+            ]
+            if kept:
+                postings[term] = (array('I', [item[0] for item in kept]), array('I', [item[1] for item in kept]))
+        self.postings = postings
+        self.terms = sorted(postings)
+
+    def expand_prefix(self, prefix):
+        start = bisect.bisect_left(self.terms, prefix)
+        terms = []
+        for term in self.terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def score(self, terms, documents, deleted):
+        average_length = self.total_length / len(self.lengths) if self.lengths else 0
+        scores = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            # Like tantivy, deleted documents count until they are merged
+            # away (here, until the next compaction or reload).
+            frequency = len(postings[0])
+            idf = math.log(1 + (documents - frequency + 0.5) / (frequency + 0.5))
+            for position, tf in zip(*postings):
+                if position in deleted:
+                    continue
+                norm = 1 - B + B * self.lengths[position] / average_length if average_length else 1
+                scores[position] = scores.get(position, 0.0) + idf * tf * (K1 + 1) / (tf + K1 * norm)
+        return scores
+
+
+class InMemoryBm25:
+    """
+    BM25 engine answering searches on a small table from memory, over the
+    ``text_fields`` of its ``Bm25Index`` with the same tokenizers and
+    normalizers. Queries are strings (``term``, ``field:term``, ``+term``,
+    ``-term``) or ``django_bm25.search`` nodes (``Term``, ``Prefix``,
+    ``Boolean`` and ``Boost``); results are ``(pk, score)`` hits, so they can
+    be loaded with ``Bm25QuerySet.hydrate()``.
+
+    ``connect()`` keeps it up to date from the model's save and delete
+    signals once the writes are committed.
+    """
+
+    def __init__(self, model, index=None):
+        self.model = model
+        if index is None:
+            indexes = get_bm25_indexes(model)
+            if not indexes:
+                raise ValueError('%s has no Bm25Index.' % model._meta.label)
+            index = indexes[0]
+        self.index = index
+        self.field_configs = dict(index.text_fields)
+        self._lock = threading.RLock()
+        self._clear()
+
+    @classmethod
+    def for_model(cls, model):
+        """
+        Return the shared, loaded and connected engine of ``model``.
+        """
+        with _registry_lock:
+            engine = _registry.get(model)
+            if engine is None:
+                engine = _registry[model] = cls(model)
+                engine.load()
+                engine.connect()
+            return engine
+
+    def _clear(self):
+        self.fields = {
+            name: FieldIndex(get_tokenizer(config))
+            for name, config in self.field_configs.items()
+        }
+        self.pks = []
+        self.positions = {}
+        self.deleted = set()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def load(self, queryset=None, chunk_size=2000):
+        if queryset is None:
+            queryset = self.model._default_manager.all()
+        names = list(self.fields)
+        rows = queryset.values_list('pk', *names).iterator(chunk_size=chunk_size)
+        with self._lock:
+            self._clear()
+            for pk, *values in rows:
+                self._add(pk, dict(zip(names, values)))
+
+    def _add(self, pk, values):
+        position = len(self.pks)
+        self.pks.append(pk)
+        self.positions[pk] = position
+        for name, field in self.fields.items():
+            field.add(position, values.get(name) or '')
+
+    def add(self, pk, values):
+        """
+        Index (or re-index) the row ``pk`` with the text ``values`` by field.
+        """
+        with self._lock:
+            self._remove(pk)
+            self._add(pk, values)
+
+    def _remove(self, pk):
+        position = self.positions.pop(pk, None)
+        if position is not None:
+            self.deleted.add(position)
+            if len(self.deleted) > COMPACT_RATIO * len(self.pks):
+                self._compact()
+
+    def _compact(self):
+        positions = {}
+        pks = []
+        for position, pk in enumerate(self.pks):
+            if position not in self.deleted:
+                positions[position] = len(pks)
+                pks.append(pk)
+        for field in self.fields.values():
+            field.compact(positions)
+        self.pks = pks
+        self.positions = {pk: position for position, pk in enumerate(pks)}
+        self.deleted = set()
+
+    def remove(self, pk):
+        with self._lock:
+            self._remove(pk)
+
+    def add_instance(self, instance):
+        self.add(instance.pk, {name: getattr(instance, name) for name in self.fields})
+
+    def parse(self, query: str):
+        must, should, must_not = [], [], []
+        for token in query.split():
+            clauses = should
+            if token[0] in '+-' and len(token) > 1:
+                clauses = must if token[0] == '+' else must_not
+                token = token[1:]
+            field, separator, value = token.partition(':')
+            if separator and field in self.fields:
+                clauses.append(Term(field, value))
+            else:
+                clauses.append(Boolean(should=[Term(name, token) for name in self.fields]))
+        return Boolean(must=must, should=should, must_not=must_not)
+
+    def evaluate(self, query):
+        documents = len(self.pks)
+        if isinstance(query, (Term, Prefix)):
+            field = self.fields.get(query.field)
+            if field is None:
+                raise InvalidQuery('%s is not a text field of the BM25 index.' % query.field)
+            if isinstance(query, Term):
+                terms = field.tokenize(str(query.value))
+            else:
+                terms = [
+                    term for prefix in field.tokenize(query.value) or ['']
+                    for term in field.expand_prefix(prefix)
+                ]
+            return field.score(terms, documents, self.deleted)
+        if isinstance(query, Boost):
+            return {
+                position: score * query.factor
+                for position, score in self.evaluate(query.query).items()
+            }
+        if isinstance(query, Boolean):
+            scores = None
+            for clause in query.must:
+                clause_scores = self.evaluate(clause)
+                if scores is None:
+                    scores = clause_scores
+                else:
+                    scores = {
+                        position: score + clause_scores[position]
+                        for position, score in scores.items() if position in clause_scores
+                    }
+            for clause in query.should:
+                for position, score in self.evaluate(clause).items():
+                    if scores is None:
+                        scores = {}
+                    if position in scores or not query.must:
+                        scores[position] = scores.get(position, 0.0) + score
+            scores = scores or {}
+            for clause in query.must_not:
+                for position in self.evaluate(clause):
+                    scores.pop(position, None)
+            return scores
+        if isinstance(query, QueryNode):
+            raise InvalidQuery(
+                '%s queries are not supported by the in-memory engine.' % query.__class__.__name__
+            )
+        raise InvalidQuery('Unsupported query %r.' % (query,))
+
+    def search(self, query, top_k=10):
+        """
+        Return the best ``top_k`` ``(pk, score)`` hits of ``query``.
+        """
+        if isinstance(query, str):
+            query = self.parse(query)
+        with self._lock:
+            scores = self.evaluate(query)
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+            return [(self.pks[position], score) for position, score in best]
+
+    def handle_save(self, sender, instance, **kwargs):
+        transaction.on_commit(lambda: self.add_instance(instance))
+
+    def handle_delete(self, sender, instance, **kwargs):
+        pk = instance.pk
+        transaction.on_commit(lambda: self.remove(pk))
+
+    def handle_bulk_write(self, sender, **kwargs):
+        transaction.on_commit(self.load)
+
+    def connect(self):
+        uid = 'django_bm25_memory_%s' % self.model._meta.label_lower
+        post_save.connect(self.handle_save, sender=self.model, dispatch_uid=uid, weak=False)
+        post_delete.connect(self.handle_delete, sender=self.model, dispatch_uid=uid, weak=False)
+        post_bulk_write.connect(self.handle_bulk_write, sender=self.model, dispatch_uid=uid, weak=False)
+
+    def disconnect(self):
+        uid = 'django_bm25_memory_%s' % self.model._meta.label_lower
+        post_save.disconnect(sender=self.model, dispatch_uid=uid)
+        post_delete.disconnect(sender=self.model, dispatch_uid=uid)
+        post_bulk_write.disconnect(sender=self.model, dispatch_uid=uid)
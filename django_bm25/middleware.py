@@ -0,0 +1,30 @@
+import time
+from django_bm25.routers import _pinned_until, search_router
+
+PIN_COOKIE = 'bm25_pinned'
+
+
+class SearchRouterMiddleware:
+    """
+    Read-your-writes for routed searches: a request that writes to a search
+    model keeps its searches, and those of the following requests of the
+    same client for ``PIN_SECONDS``, on the primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # The cookie expires after PIN_SECONDS, a request carrying it is
+        # pinned for its whole duration.
+        pinned_until = time.monotonic() + search_router.pin_seconds if PIN_COOKIE in request.COOKIES else 0.0
+        token = _pinned_until.set(pinned_until)
+        try:
+            response = self.get_response(request)
+            if _pinned_until.get() != pinned_until:
+                response.set_cookie(
+                    PIN_COOKIE, '1', httponly=True, samesite='Lax', max_age=search_router.pin_seconds,
+                )
+        finally:
+            _pinned_until.reset(token)
+        return response
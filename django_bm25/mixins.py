@@ -1,15 +1,324 @@
+import copy
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import F, QuerySet, TextField, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
+from django.db.models.lookups import GreaterThanOrEqual
+from django.db.models.signals import class_prepared
+from django_bm25.backends import get_backend
+from django_bm25.expressions import (
+    HYBRID_SCORE_COLUMN, Bm25Match, Bm25Score, DerivedTable, HybridScore,
+)
+from django_bm25.indexes import get_bm25_indexes
+from django_bm25.pushdown import split_filters
+from django_bm25.querysets import Bm25QuerySet
+from django_bm25.routers import search_router
+from django_bm25.search import QueryNode, compile_query
+
+SEARCH_MANY_ALIAS = 'bm25_queries'
+COLLAPSE_RANK_ALIAS = 'collapse_rank'
+HYBRID_FUSIONS = ('rrf', 'weighted')
+VECTOR_DISTANCES = {
+    'l2': '<->',
+    'cosine': '<=>',
+    'inner_product': '<#>',
+}
+
+HYBRID_SQL = (
+    'WITH bm25_lexical AS ('
+    'SELECT pk, score, row_number() OVER (ORDER BY score DESC) AS rank FROM (%(lexical)s) AS hits (pk, score)'
+    '), bm25_semantic AS ('
+    'SELECT pk, distance, row_number() OVER (ORDER BY distance) AS rank FROM ('
+    'SELECT %(pk)s AS pk, %(vector)s %(operator)s CAST(%%s AS vector) AS distance '
+    'FROM %(table)s ORDER BY distance LIMIT %%s'
+    ') AS hits'
+    '), bm25_fused AS ('
+    'SELECT pk, SUM(score) AS score FROM (%(candidates)s) AS candidates GROUP BY pk'
+    ') '
+    'SELECT %(table)s.*, bm25_fused.score AS %(score)s '
+    'FROM %(table)s INNER JOIN bm25_fused ON %(table)s.%(pk)s = bm25_fused.pk'
+)
+
+# Reciprocal rank fusion: weight / (k + rank) summed over both lists.
+RRF_CANDIDATES_SQL = (
+    'SELECT pk, CAST(%s AS double precision) / (%s + rank) AS score FROM bm25_lexical '
+    'UNION ALL '
+    'SELECT pk, CAST(%s AS double precision) / (%s + rank) AS score FROM bm25_semantic'
+)
+
+# Weighted sum of the scores min-max normalized within each candidate set,
+# lower distances scoring higher.
+WEIGHTED_CANDIDATES_SQL = (
+    'SELECT pk, CAST(%s AS double precision) * COALESCE('
+    '(score - MIN(score) OVER ()) / NULLIF(MAX(score) OVER () - MIN(score) OVER (), 0), 1'
+    ') AS score FROM bm25_lexical '
+    'UNION ALL '
+    'SELECT pk, CAST(%s AS double precision) * COALESCE('
+    '(MAX(distance) OVER () - distance) / NULLIF(MAX(distance) OVER () - MIN(distance) OVER (), 0), 1'
+    ') AS score FROM bm25_semantic'
+)
+
 
 class FullTextSearchMixin:
     @classmethod
-    def search(cls, query: str, score=True):
-        db_table = cls._meta.db_table
-        queryset = cls.objects.extra(where=[db_table + " @@@ %s"], params=[query])
-        
-        if not score:
+    def get_search_queryset(cls, using=None):
+        queryset = cls.objects.all()
+        if using is None:
+            using = search_router.db_for_search(cls)
+        if using is not None:
+            queryset = queryset.using(using)
+        if isinstance(queryset, Bm25QuerySet):
+            return queryset
+        return Bm25QuerySet(
+            model=cls, query=queryset.query, using=queryset._db, hints=queryset._hints
+        )
+
+    @classmethod
+    def normalize_query(cls, query: str):
+        return ' '.join(query.split())
+
+    @classmethod
+    def get_search_index(cls):
+        indexes = get_bm25_indexes(cls)
+        return indexes[0] if indexes else None
+
+    @classmethod
+    def search(cls, query, score=True, top_k=None, filters=None, min_score=None,
+               collapse_by=None, per_group=None, using=None):
+        if per_group is not None and collapse_by is None:
+            raise ValueError('per_group requires collapse_by.')
+        if per_group is not None and per_group < 1:
+            raise ValueError('per_group must be at least 1.')
+
+        if isinstance(query, QueryNode):
+            query = compile_query(query, cls)
+        else:
+            query = cls.normalize_query(query)
+        queryset = cls.get_search_queryset(using)
+        backend = get_backend(connections[queryset.db])
+        remainder = None
+        if filters is not None:
+            # Predicates on fast fields of the index shrink the candidate
+            # set before scoring, the others are filtered in SQL.
+            index = cls.get_search_index()
+            if not backend.supports_query_pushdown:
+                index = None
+            clauses, remainder = split_filters(index, filters)
+            if clauses:
+                # Boosted to zero, the clauses only restrict the matches and
+                # leave the score (and so min_score) as without filters.
+                query = '(%s) AND %s' % (
+                    query, ' AND '.join('(%s)^0' % clause for clause in clauses)
+                )
+
+        queryset = backend.join_matches(queryset.filter(Bm25Match(query)), query)
+        queryset._search_query = query
+        if remainder:
+            queryset = queryset.filter(remainder)
+
+        if min_score is not None:
+            queryset = queryset.filter(GreaterThanOrEqual(Bm25Score(), min_score))
+
+        if score:
+            queryset = queryset.annotate(score=Bm25Score())
+
+        if collapse_by is not None:
+            # Keep the best per_group hits of each group with a window
+            # function, filtered by the database in a wrapping subquery.
+            queryset = queryset.annotate(**{COLLAPSE_RANK_ALIAS: Window(
+                RowNumber(),
+                partition_by=F(collapse_by),
+                order_by=[Bm25Score().desc(), F('pk').asc()],
+            )}).filter(**{'%s__lte' % COLLAPSE_RANK_ALIAS: per_group or 1})
+
+        if top_k is None:
+            return queryset
+
+        # Order only by the score so that the planner can use a bounded
+        # top-N sort (or the index scan itself) instead of sorting every
+        # match in the heap.
+        ordering = '-score' if score else Bm25Score().desc()
+        return queryset.order_by(ordering)[:top_k]
+
+    @classmethod
+    async def asearch(cls, query: str, top_k=None, **kwargs):
+        """
+        Evaluate ``search()`` from async code with a two-phase fetch,
+        returning the ranked model instances.
+        """
+        # Routing (which may probe the replicas), the hits and the hydration
+        # all run in a single thread hop.
+        return await sync_to_async(cls._search_hydrated)(query, top_k, **kwargs)
+
+    @classmethod
+    def _search_hydrated(cls, query, top_k, **kwargs):
+        queryset = cls.search(query, top_k=top_k, **kwargs)
+        return queryset.hydrate(queryset.hits())
+
+    @classmethod
+    def search_hybrid_sql(cls, query, embedding, vector_field, k=60, weights=(1.0, 1.0),
+                          fusion='rrf', candidates=100, distance='cosine', using=None):
+        """
+        Build the statement returning the table rows present in the top
+        ``candidates`` of the BM25 search or of the vector search, with their
+        fused score in the ``bm25_hybrid_score`` column.
+        """
+        if fusion not in HYBRID_FUSIONS:
+            raise ValueError(
+                'Unknown fusion %r, expected one of %s.' % (fusion, ', '.join(HYBRID_FUSIONS))
+            )
+        if distance not in VECTOR_DISTANCES:
+            raise ValueError(
+                'Unknown distance %r, expected one of %s.'
+                % (distance, ', '.join(VECTOR_DISTANCES))
+            )
+        lexical_weight, vector_weight = weights
+
+        lexical = cls.search(query, top_k=candidates, using=using).values_list('pk', 'score')
+        get_backend(connections[lexical.db]).check_supported('hybrid_search', 'Hybrid search')
+        lexical_sql, lexical_params = lexical.query.get_compiler(using=lexical.db).as_sql()
+
+        if fusion == 'rrf':
+            candidates_sql = RRF_CANDIDATES_SQL
+            candidates_params = (lexical_weight, k, vector_weight, k)
+        else:
+            candidates_sql = WEIGHTED_CANDIDATES_SQL
+            candidates_params = (lexical_weight, vector_weight)
+
+        connection = connections[lexical.db]
+        quote_name = connection.ops.quote_name
+        sql = HYBRID_SQL % {
+            'lexical': lexical_sql,
+            'pk': quote_name(cls._meta.pk.column),
+            'vector': quote_name(cls._meta.get_field(vector_field).column),
+            'operator': VECTOR_DISTANCES[distance],
+            'table': quote_name(cls._meta.db_table),
+            'candidates': candidates_sql,
+            'score': HYBRID_SCORE_COLUMN,
+        }
+        vector = '[%s]' % ','.join(str(float(value)) for value in embedding)
+        params = (*lexical_params, vector, candidates, *candidates_params)
+        return lexical.db, sql, params
+
+    @classmethod
+    def search_hybrid(cls, query, embedding, vector_field, k=60, weights=(1.0, 1.0),
+                      fusion='rrf', top_k=None, candidates=100, distance='cosine', using=None):
+        """
+        Rank by BM25 and pgvector similarity in a single statement: the top
+        ``candidates`` of both searches are computed in CTEs and fused with
+        reciprocal rank fusion (``k`` and ``weights``) or, with
+        ``fusion='weighted'``, a weighted sum of their normalized scores.
+
+        Return a queryset ordered by the fused ``score``. Further filters
+        apply after fusion and cursor pagination is not supported.
+        """
+        using, sql, params = cls.search_hybrid_sql(
+            query, embedding, vector_field, k=k, weights=weights, fusion=fusion,
+            candidates=candidates, distance=distance, using=using,
+        )
+        queryset = cls.get_search_queryset(using)
+        alias = queryset.query.get_initial_alias()
+        queryset.query.alias_map[alias] = DerivedTable(sql, params, cls._meta.db_table, alias)
+        queryset._search_query = cls.normalize_query(query) if isinstance(query, str) else query
+        queryset = queryset.annotate(score=HybridScore()).order_by('-score', 'pk')
+        if top_k is None:
             return queryset
-        
-        queryset = queryset.extra(select={
-            'score': 'paradedb.rank_bm25(ctid)',
-        })
+        return queryset[:top_k]
+
+    @classmethod
+    def search_many_sql(cls, queries, top_k: int, using=None):
+        """
+        Build one statement that joins a ``VALUES`` list of queries
+        ``LATERAL`` to a top-K BM25 search, returning
+        ``(position, pk, score)`` rows.
+        """
+        queryset = cls.get_search_queryset(using)
+        get_backend(connections[queryset.db]).check_supported('search_many', 'search_many()')
+        column = RawSQL(
+            '%s.query' % SEARCH_MANY_ALIAS, (), output_field=TextField()
+        )
+        inner = (
+            queryset
+            .filter(Bm25Match(column))
+            .annotate(score=Bm25Score())
+            .order_by('-score')
+            .values_list('pk', 'score')[:top_k]
+        )
+        inner_sql, inner_params = inner.query.get_compiler(using=inner.db).as_sql()
+        values = ', '.join(['(%s, %s)'] * len(queries))
+        values_params = []
+        for position, query in enumerate(queries):
+            values_params += [position, cls.normalize_query(query)]
+        sql = (
+            'SELECT %(alias)s.position, hits.pk, hits.score '
+            'FROM (VALUES %(values)s) AS %(alias)s (position, query) '
+            'CROSS JOIN LATERAL (%(inner)s) AS hits (pk, score) '
+            'ORDER BY %(alias)s.position, hits.score DESC'
+        ) % {'alias': SEARCH_MANY_ALIAS, 'values': values, 'inner': inner_sql}
+        return inner.db, sql, (*values_params, *inner_params)
+
+    @classmethod
+    def search_many(cls, queries, top_k=10, hydrate=True, using=None):
+        """
+        Run several searches in a single round trip. Return one ranked list
+        per query, of model instances (with ``score`` set) or, when
+        ``hydrate`` is false, of ``(pk, score)`` pairs.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+
+        using, sql, params = cls.search_many_sql(queries, top_k, using=using)
+        results = [[] for query in queries]
+        with connections[using].cursor() as cursor:
+            cursor.execute(sql, params)
+            for position, pk, score in cursor.fetchall():
+                results[position].append((pk, score))
+
+        if not hydrate:
+            return results
+
+        pks = {pk for hits in results for pk, score in hits}
+        objects = cls.get_search_queryset(using).in_bulk(pks)
+        hydrated = []
+        seen = set()
+        for hits in results:
+            items = []
+            for pk, score in hits:
+                obj = objects.get(pk)
+                if obj is None:
+                    continue
+                # The same row can rank for several queries with distinct
+                # scores, only share the instance the first time.
+                if pk in seen:
+                    obj = copy.copy(obj)
+                seen.add(pk)
+                obj.score = score
+                items.append(obj)
+            hydrated.append(items)
+        return hydrated
+
+
+def get_search_queryset_class(queryset_class):
+    if issubclass(queryset_class, Bm25QuerySet):
+        return queryset_class
+    if queryset_class is QuerySet:
+        return Bm25QuerySet
+    return type('Bm25%s' % queryset_class.__name__, (Bm25QuerySet, queryset_class), {})
+
+
+def prepare_search_model(sender, **kwargs):
+    """
+    Make the managers of ``FullTextSearchMixin`` models return a
+    ``Bm25QuerySet`` (combined with their own queryset class), so that
+    writes through them, e.g. ``objects.update()``, send ``post_bulk_write``
+    and invalidate caches and in-memory indexes.
+    """
+    if not issubclass(sender, FullTextSearchMixin) or sender._meta.abstract:
+        return
+    for manager in sender._meta.local_managers:
+        manager._queryset_class = get_search_queryset_class(manager._queryset_class)
+
 
-        return queryset
+class_prepared.connect(prepare_search_model)
@@ -1,5 +1,132 @@
-from django.contrib.postgres.operations import CreateExtension
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    CreateExtension,
+    NotInTransactionMixin,
+    RemoveIndexConcurrently,
+)
+from django.db.migrations.operations.base import Operation
+from django_bm25.indexes import Bm25Index
+from django_bm25.reindex import SHADOW_SUFFIX, get_suffixed_name, get_swap_sql, shadow_reindex
+from django_bm25.schema import add_index_concurrently
 
 class Bm25Extension(CreateExtension):
     def __init__(self):
         self.name = "pg_bm25"
+
+
+class AddBm25IndexConcurrently(AddIndexConcurrently):
+    """
+    Create a Bm25Index with CREATE INDEX CONCURRENTLY. An invalid index
+    left by a previously failed build is dropped first.
+    """
+
+    def __init__(self, model_name, index, drop_invalid=True):
+        if not isinstance(index, Bm25Index):
+            raise TypeError("%s requires a Bm25Index." % self.__class__.__name__)
+        super().__init__(model_name, index)
+        self.drop_invalid = drop_invalid
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        if not self.drop_invalid:
+            kwargs["drop_invalid"] = self.drop_invalid
+        return name, args, kwargs
+
+    def describe(self):
+        return "Concurrently create BM25 index %s on model %s" % (
+            self.index.name,
+            self.model_name,
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            add_index_concurrently(schema_editor, model, self.index, self.drop_invalid)
+
+
+class RemoveBm25IndexConcurrently(RemoveIndexConcurrently):
+    def __init__(self, model_name, name, drop_invalid=True):
+        super().__init__(model_name, name)
+        self.drop_invalid = drop_invalid
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        if not self.drop_invalid:
+            kwargs["drop_invalid"] = self.drop_invalid
+        return name, args, kwargs
+
+    def describe(self):
+        return "Concurrently remove BM25 index %s from %s" % (self.name, self.model_name)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            to_model_state = to_state.models[app_label, self.model_name_lower]
+            index = to_model_state.get_index_by_name(self.name)
+            add_index_concurrently(schema_editor, model, index, self.drop_invalid)
+
+
+class ReindexBm25Concurrently(NotInTransactionMixin, Operation):
+    """
+    Replace the configuration of an existing Bm25Index without downtime:
+    the new index is built concurrently under a shadow name and swapped
+    with the live one in a short transaction.
+    """
+    atomic = False
+    reduces_to_sql = False
+
+    def __init__(self, model_name, index):
+        if not isinstance(index, Bm25Index):
+            raise TypeError("%s requires a Bm25Index." % self.__class__.__name__)
+        self.model_name = model_name
+        self.index = index
+
+    @property
+    def model_name_lower(self):
+        return self.model_name.lower()
+
+    def deconstruct(self):
+        kwargs = {
+            "model_name": self.model_name,
+            "index": self.index,
+        }
+        return self.__class__.__qualname__, [], kwargs
+
+    def describe(self):
+        return "Concurrently rebuild BM25 index %s on model %s" % (
+            self.index.name,
+            self.model_name,
+        )
+
+    @property
+    def migration_name_fragment(self):
+        return "reindex_%s" % self.index.name.lower()
+
+    def state_forwards(self, app_label, state):
+        state.remove_index(app_label, self.model_name_lower, self.index.name)
+        state.add_index(app_label, self.model_name_lower, self.index)
+
+    def _reindex(self, app_label, schema_editor, state, index):
+        self._ensure_not_in_transaction(schema_editor)
+        model = state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        if not schema_editor.collect_sql:
+            shadow_reindex(model, index, using=schema_editor.connection.alias)
+            return
+        shadow = index.clone()
+        shadow.name = get_suffixed_name(index.name, SHADOW_SUFFIX, schema_editor.connection)
+        schema_editor.add_index(model, shadow, concurrently=True)
+        swap, drop = get_swap_sql(schema_editor.connection, index.name, shadow.name)
+        for sql in ["BEGIN", *swap, "COMMIT", drop]:
+            schema_editor.execute(sql, params=None)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._reindex(app_label, schema_editor, to_state, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        to_model_state = to_state.models[app_label, self.model_name_lower]
+        index = to_model_state.get_index_by_name(self.index.name)
+        self._reindex(app_label, schema_editor, to_state, index)
@@ -0,0 +1,142 @@
+import base64
+import binascii
+import json
+from django.core.paginator import InvalidPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.functional import cached_property
+from django_bm25.expressions import Bm25Score, Bm25SearchAfter
+from django_bm25.querysets import DEFAULT_COUNT_CAP
+
+
+def encode_cursor(score: float, pk) -> str:
+    data = json.dumps([score, pk], cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        score, pk = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        return float(score), pk
+    except (binascii.Error, TypeError, ValueError):
+        raise PageNotAnInteger('That page cursor is not valid')
+
+
+class Bm25Page(Page):
+    def __init__(self, object_list, number, paginator, cursor=None, next_cursor=None):
+        super().__init__(object_list, number, paginator)
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    def __repr__(self):
+        if self.cursor is None:
+            return super().__repr__()
+        return '<Page after %s>' % self.cursor
+
+    def has_next(self):
+        if self.cursor is None:
+            return super().has_next()
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        # Cursor pages only know the hit they continue from, so they can
+        # only be traversed forwards.
+        if self.cursor is None:
+            return super().has_previous()
+        return False
+
+    def next_page_number(self):
+        if self.cursor is None:
+            return super().next_page_number()
+        if self.next_cursor is None:
+            raise InvalidPage('That page contains no results')
+        return self.next_cursor
+
+    def start_index(self):
+        if self.cursor is None:
+            return super().start_index()
+        return 1 if len(self) else 0
+
+    def end_index(self):
+        if self.cursor is None:
+            return super().end_index()
+        return len(self)
+
+
+class Bm25Paginator(Paginator):
+    """
+    Paginator for ``FullTextSearchMixin.search()`` results.
+
+    Integer page numbers behave like Django's ``Paginator`` (``OFFSET``
+    based) so that generic list views and the admin keep working. Every
+    page also carries a ``next_cursor`` token; passing it back to
+    ``page()``/``get_page()`` continues with ``WHERE (score, pk) < (...)``
+    instead of re-scoring and skipping all the previous hits.
+
+    ``count_strategy`` selects a ``Bm25QuerySet.estimated_count()``
+    strategy for the total, which otherwise counts every match. When the
+    count is not exact the last numbered page still gets a ``next_cursor``
+    if it is full.
+    """
+
+    def __init__(self, object_list, per_page, *args, count_strategy=None,
+                 count_cap=DEFAULT_COUNT_CAP, **kwargs):
+        if 'score' not in object_list.query.annotations:
+            object_list = object_list.annotate(score=Bm25Score())
+        object_list = object_list.order_by('-score', '-pk')
+        self.count_strategy = count_strategy
+        self.count_cap = count_cap
+        super().__init__(object_list, per_page, *args, **kwargs)
+
+    @cached_property
+    def count(self):
+        if self.count_strategy is None:
+            return self.object_list.count()
+        return self.object_list.estimated_count(self.count_strategy, cap=self.count_cap)
+
+    @property
+    def count_is_exact(self):
+        return getattr(self.count, 'exact', True)
+
+    def is_cursor(self, number):
+        return isinstance(number, str) and not number.strip().isdigit()
+
+    def validate_number(self, number):
+        if self.is_cursor(number):
+            return decode_cursor(number)
+        return super().validate_number(number)
+
+    def get_page(self, number):
+        if self.is_cursor(number):
+            try:
+                return self.page(number)
+            except PageNotAnInteger:
+                number = 1
+        return super().get_page(number)
+
+    def page(self, number):
+        if not self.is_cursor(number):
+            page = super().page(number)
+            page.object_list = list(page.object_list)
+            page.next_cursor = None
+            if page.has_next() or not self.count_is_exact and len(page.object_list) == self.per_page:
+                page.next_cursor = self._get_next_cursor(page.object_list)
+            return page
+
+        score, pk = self.validate_number(number)
+        queryset = self.object_list.filter(Bm25SearchAfter(score, pk))
+        object_list = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(object_list) > self.per_page:
+            object_list = object_list[:self.per_page]
+            next_cursor = self._get_next_cursor(object_list)
+        return self._get_page(object_list, None, self, cursor=number, next_cursor=next_cursor)
+
+    def _get_next_cursor(self, object_list):
+        if not object_list:
+            return None
+        last = object_list[-1]
+        return encode_cursor(last.score, last.pk)
+
+    def _get_page(self, *args, **kwargs):
+        return Bm25Page(*args, **kwargs)
@@ -0,0 +1,122 @@
+import decimal
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django_bm25.search import Range, Term
+
+RANGE_LOOKUPS = ('gt', 'gte', 'lt', 'lte')
+
+
+def get_pushdown_fields(index):
+    """
+    Return the fields of ``index`` whose predicates can run inside the BM25
+    query, mapped to their type: the indexed fast numeric and boolean
+    fields.
+    """
+    fields = {}
+    for field_type in ['numeric', 'boolean']:
+        for field, config in getattr(index, '%s_fields' % field_type).items():
+            if config.get('indexed', True) and config.get('fast', True):
+                fields[field] = field_type
+    return fields
+
+
+def format_value(field_type, value):
+    if field_type == 'boolean':
+        if not isinstance(value, bool):
+            return None
+        return 'true' if value else 'false'
+    if isinstance(value, bool) or not isinstance(value, (int, float, decimal.Decimal)):
+        return None
+    return str(value)
+
+
+def translate_lookup(fields, lookup, value):
+    """
+    Translate a single ``field__lookup=value`` predicate into query syntax,
+    or return None when it has to be filtered in SQL.
+    """
+    field, _, lookup = lookup.partition(LOOKUP_SEP)
+    lookup = lookup or 'exact'
+    field_type = fields.get(field)
+    if field_type is None:
+        return None
+
+    if lookup == 'exact':
+        if format_value(field_type, value) is None:
+            return None
+        if field_type == 'boolean':
+            return Term(field, value).compile()
+        return Range(field, gte=value, lte=value).compile()
+
+    if lookup == 'in':
+        clauses = [translate_lookup(fields, field, item) for item in value]
+        if not clauses or None in clauses:
+            return None
+        return '(%s)' % ' OR '.join(clauses)
+
+    if field_type != 'numeric':
+        return None
+
+    if lookup == 'range':
+        low, high = value
+        if format_value(field_type, low) is None or format_value(field_type, high) is None:
+            return None
+        return Range(field, gte=low, lte=high).compile()
+
+    if lookup in RANGE_LOOKUPS:
+        if format_value(field_type, value) is None:
+            return None
+        return Range(field, **{lookup: value}).compile()
+
+    return None
+
+
+PUSHDOWN_CONNECTORS = (Q.AND, Q.OR)
+
+
+def translate_q(fields, q):
+    # The query syntax has no XOR.
+    if q.negated or q.connector not in PUSHDOWN_CONNECTORS:
+        return None
+    clauses = []
+    for child in q.children:
+        if isinstance(child, Q):
+            clause = translate_q(fields, child)
+        else:
+            clause = translate_lookup(fields, *child)
+        if clause is None:
+            return None
+        clauses.append(clause)
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return '(%s)' % (' %s ' % q.connector).join(clauses)
+
+
+def split_filters(index, filters):
+    """
+    Split ``filters`` (a Q or a dict of lookups) into query syntax clauses
+    that can be ANDed to the BM25 query and a Q with the predicates left to
+    SQL.
+    """
+    if not isinstance(filters, Q):
+        filters = Q(**filters)
+    fields = get_pushdown_fields(index) if index is not None else {}
+
+    if filters.connector != Q.AND or filters.negated:
+        clause = translate_q(fields, filters)
+        return ([clause], Q()) if clause is not None else ([], filters)
+
+    clauses = []
+    remainder = Q()
+    for child in filters.children:
+        if isinstance(child, Q):
+            clause = translate_q(fields, child)
+        else:
+            clause = translate_lookup(fields, *child)
+        if clause is not None:
+            clauses.append(clause)
+        else:
+            remainder &= child if isinstance(child, Q) else Q(child)
+    return clauses, remainder
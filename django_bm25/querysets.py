@@ -0,0 +1,328 @@
+import asyncio
+import functools
+import itertools
+import json
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import QuerySet
+from django_bm25.backends import get_backend
+from django_bm25.expressions import Bm25Score
+from django_bm25.indexes import get_bm25_indexes
+from django_bm25.instrumentation import instrument_search
+from django_bm25.signals import post_bulk_write
+
+# Only the pk, the facet columns and the score of the matches are
+# materialized, the rows of the top hits are read from the table.
+FACETS_SQL = (
+    'WITH bm25_matches (%(columns)s) AS MATERIALIZED (%(matches)s) '
+    'SELECT bm25_facets.data, %(fields)s, bm25_hits.score FROM ('
+    'SELECT json_agg(json_build_array(facet_position, facet_value, facet_count)) AS data FROM ('
+    'SELECT %(position)s AS facet_position, %(value)s AS facet_value, COUNT(*) AS facet_count '
+    'FROM bm25_matches GROUP BY GROUPING SETS (%(grouping_sets)s)'
+    ') bm25_counts'
+    ') bm25_facets LEFT JOIN ('
+    'SELECT bm25_pk, score FROM bm25_matches ORDER BY score DESC LIMIT %%s OFFSET %%s'
+    ') bm25_hits ON true '
+    'LEFT JOIN %(table)s ON %(table)s.%(pk)s = bm25_hits.bm25_pk '
+    'ORDER BY bm25_hits.score DESC'
+)
+
+COUNT_STRATEGIES = ('capped', 'planner', 'cached')
+DEFAULT_COUNT_CAP = 1000
+DEFAULT_COUNT_MAX_AGE = 60
+
+
+class Bm25Count(int):
+    """
+    Result count that records whether it is exact or an estimate (a capped
+    count, a planner estimate or a cached count still being computed).
+    """
+    def __new__(cls, value, exact=True):
+        count = super().__new__(cls, value)
+        count.exact = exact
+        return count
+
+    def __repr__(self):
+        return '<%s: %s%d>' % (self.__class__.__name__, '' if self.exact else '~', self)
+
+
+class Bm25Facets:
+    def __init__(self, hits, counts):
+        self.hits = hits
+        self.counts = counts
+
+    def __repr__(self):
+        return '<%s: %d hits, %s>' % (self.__class__.__name__, len(self.hits), self.counts)
+
+
+class Bm25QuerySet(QuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._search_query = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._search_query = self._search_query
+        return clone
+
+    def _fetch_all(self):
+        if self._result_cache is not None or self._search_query is None:
+            return super()._fetch_all()
+        with instrument_search(self) as timing:
+            super()._fetch_all()
+            timing.rows = len(self._result_cache)
+
+    def _with_score(self):
+        if 'score' in self.query.annotations:
+            return self
+        return self.annotate(score=Bm25Score())
+
+    def hits(self):
+        """
+        Phase one of a two-phase search: return ``(pk, score)`` pairs in
+        rank order without fetching or instantiating the rows.
+        """
+        return list(self._with_score().values_list('pk', 'score'))
+
+    async def ahits(self):
+        return [hit async for hit in self.aiter_hits()]
+
+    async def aiter_hits(self, chunk_size=2000):
+        """
+        Asynchronously iterate over ``(pk, score)`` pairs in rank order.
+        """
+        # QuerySet.aiterator() runs values_list() queries on the event loop,
+        # so fetch the chunks of a sync iterator in a thread.
+        hits = self._with_score().values_list('pk', 'score').iterator(chunk_size=chunk_size)
+        fetch = sync_to_async(lambda: list(itertools.islice(hits, chunk_size)))
+        while True:
+            chunk = await fetch()
+            for hit in chunk:
+                yield hit
+            if len(chunk) < chunk_size:
+                # The iterator is exhausted, don't hop to a thread for nothing.
+                break
+
+    def cached_hits(self, cache=None):
+        """
+        ``hits()`` served from the search cache (see ``django_bm25.cache``).
+        """
+        if cache is None:
+            from django_bm25.cache import search_cache as cache
+        return cache.get_or_set(self, self.hits)
+
+    async def acached_hits(self, cache=None):
+        return await sync_to_async(self.cached_hits)(cache)
+
+    def hydrate(self, hits, batch_size=None):
+        """
+        Phase two of a two-phase search: load the models for ``hits`` with
+        one ``pk__in`` query (or one per ``batch_size`` hits), keeping the
+        rank order and this queryset's select_related/prefetch_related and
+        deferred fields. The score is set on each instance.
+        """
+        hits = list(hits)
+        if not hits:
+            return []
+        if self._search_query is None:
+            return self._hydrate(hits, batch_size)
+        with instrument_search(self, phase='hydrate') as timing:
+            results = self._hydrate(hits, batch_size)
+            timing.rows = len(results)
+        return results
+
+    def _hydrate(self, hits, batch_size):
+        batch_size = batch_size or len(hits)
+        objects = {}
+        for start in range(0, len(hits), batch_size):
+            batch = hits[start:start + batch_size]
+            queryset = self.model._default_manager.using(self.db).filter(
+                pk__in=[pk for pk, score in batch]
+            )
+            queryset.query.select_related = self.query.select_related
+            queryset.query.deferred_loading = self.query.deferred_loading
+            queryset._prefetch_related_lookups = self._prefetch_related_lookups
+            objects.update((obj.pk, obj) for obj in queryset)
+
+        results = []
+        for pk, score in hits:
+            obj = objects.get(pk)
+            if obj is None:
+                # Deleted between the two phases.
+                continue
+            obj.score = score
+            results.append(obj)
+        return results
+
+    async def ahydrate(self, hits, batch_size=None):
+        return await sync_to_async(self.hydrate)(hits, batch_size)
+
+    def get_facet_fields(self, names):
+        index_fields = {}
+        for index in get_bm25_indexes(self.model):
+            index_fields.update(index.get_fields_config())
+        fields = []
+        for name in names:
+            config = index_fields.get(name)
+            if (
+                config is None
+                or config['type'] == 'json'
+                or (config['type'] == 'text' and not config.get('fast'))
+            ):
+                raise ValueError(
+                    "%s is not a numeric, boolean or fast text field of a Bm25Index on %s."
+                    % (name, self.model._meta.label)
+                )
+            fields.append(self.model._meta.get_field(name))
+        return fields
+
+    def facets(self, fields, top_k=None):
+        """
+        Return the top ``top_k`` hits (or this queryset's slice) and the
+        number of matches per value of each of ``fields``, computed in a
+        single statement over one scan of the match set.
+        """
+        get_backend(connections[self.db]).check_supported('facets', 'Faceted search')
+        queryset = self._with_score()._chain()
+        offset, limit = queryset.query.low_mark, queryset.query.high_mark
+        if top_k is not None:
+            offset, limit = 0, top_k
+        elif limit is not None:
+            limit -= offset
+        queryset.query.clear_limits()
+        queryset.query.clear_ordering(force=True)
+
+        facet_fields = self.get_facet_fields(fields)
+        quote_name = connections[self.db].ops.quote_name
+        columns = ['bm25_facet_%d' % i for i in range(len(facet_fields))]
+        position = 'CASE %s END' % ' '.join(
+            'WHEN GROUPING(%s) = 0 THEN %d' % (column, i) for i, column in enumerate(columns)
+        )
+        value = 'CASE %s END' % ' '.join(
+            'WHEN GROUPING(%s) = 0 THEN to_json(%s)' % (column, column) for column in columns
+        )
+
+        concrete_fields = self.model._meta.concrete_fields
+        attnames = [field.attname for field in concrete_fields]
+        matches = queryset.values_list('pk', *[field.attname for field in facet_fields], 'score')
+        matches_sql, matches_params = matches.query.get_compiler(using=self.db).as_sql()
+        table = quote_name(self.model._meta.db_table)
+        sql = FACETS_SQL % {
+            'columns': ', '.join(['bm25_pk', *columns, 'score']),
+            'matches': matches_sql,
+            'fields': ', '.join('%s.%s' % (table, quote_name(field.column)) for field in concrete_fields),
+            'table': table,
+            'pk': quote_name(self.model._meta.pk.column),
+            'position': position,
+            'value': value,
+            'grouping_sets': ', '.join('(%s)' % column for column in columns),
+        }
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, (*matches_params, limit, offset))
+            rows = cursor.fetchall()
+
+        counts = {field: [] for field in fields}
+        hits = []
+        for data, *values in rows:
+            # Without matches, the only row has no hit.
+            if values[-1] is None:
+                continue
+            obj = self.model.from_db(self.db, attnames, values[:-1])
+            obj.score = values[-1]
+            hits.append(obj)
+        for position, value, count in (rows[0][0] if rows else None) or []:
+            counts[fields[position]].append((value, count))
+        for values in counts.values():
+            values.sort(key=lambda item: -item[1])
+        return Bm25Facets(hits, counts)
+
+    def estimated_count(self, strategy='capped', cap=DEFAULT_COUNT_CAP,
+                        max_age=DEFAULT_COUNT_MAX_AGE, cache=None):
+        """
+        Count the results without scanning every match:
+
+        * ``capped`` counts at most ``cap + 1`` rows in a ``LIMIT``
+          subquery, returning ``cap`` (not exact) when there are more;
+        * ``planner`` returns the row estimate of ``EXPLAIN``;
+        * ``cached`` returns the exact count from the search cache,
+          refreshing it in the background when missing (returning the
+          planner estimate, or the capped count on SQLite, meanwhile) or
+          older than ``max_age`` seconds.
+
+        Return a ``Bm25Count``.
+        """
+        if strategy not in COUNT_STRATEGIES:
+            raise ValueError(
+                'Unknown count strategy %r, expected one of %s.'
+                % (strategy, ', '.join(COUNT_STRATEGIES))
+            )
+        queryset = self._chain()
+        if not queryset.query.is_sliced:
+            # The ordering doesn't change the count, except which rows a
+            # slice keeps.
+            queryset.query.clear_ordering(force=True)
+        if strategy == 'planner':
+            return queryset._planner_count()
+        if strategy == 'cached':
+            if cache is None:
+                from django_bm25.cache import search_cache as cache
+            fallback = queryset._planner_count
+            if not get_backend(connections[self.db]).supports_planner_count:
+                fallback = functools.partial(queryset._capped_count, cap)
+            count, cached = cache.get_or_refresh(
+                queryset, queryset._chain().count, fallback, max_age, kind='count'
+            )
+            return Bm25Count(count, exact=cached)
+        return queryset._capped_count(cap)
+
+    def _capped_count(self, cap):
+        if self.query.is_sliced and self.query.high_mark is not None:
+            if self.query.high_mark - self.query.low_mark <= cap:
+                return Bm25Count(self.count())
+        count = self.values('pk')[:cap + 1].count()
+        if count > cap:
+            return Bm25Count(cap, exact=False)
+        return Bm25Count(count)
+
+    def _planner_count(self):
+        get_backend(connections[self.db]).check_supported('planner_count', 'Counting from the planner estimate')
+        plan = json.loads(self.explain(format='json'))
+        return Bm25Count(plan[0]['Plan']['Plan Rows'], exact=False)
+
+    async def aestimated_count(self, *args, **kwargs):
+        return await sync_to_async(self.estimated_count)(*args, **kwargs)
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        post_bulk_write.send(sender=self.model, using=self.db)
+        return rows
+
+    def bulk_create(self, *args, **kwargs):
+        objs = super().bulk_create(*args, **kwargs)
+        post_bulk_write.send(sender=self.model, using=self.db)
+        return objs
+
+    def bulk_update(self, *args, **kwargs):
+        rows = super().bulk_update(*args, **kwargs)
+        post_bulk_write.send(sender=self.model, using=self.db)
+        return rows
+
+
+def _hits_on_own_connection(queryset):
+    try:
+        return queryset.hits()
+    finally:
+        connections[queryset.db].close_if_unusable_or_obsolete()
+
+
+async def agather_hits(*querysets):
+    """
+    Run the ``hits()`` of several independent searches concurrently. Each
+    search runs in its own worker thread and so on its own database
+    connection; they don't see uncommitted changes of the caller.
+    """
+    return await asyncio.gather(*(
+        sync_to_async(_hits_on_own_connection, thread_sensitive=False)(queryset)
+        for queryset in querysets
+    ))
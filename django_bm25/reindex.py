@@ -0,0 +1,123 @@
+import threading
+import time
+from django.db import connections, router, transaction
+from django_bm25.indexes import get_bm25_indexes
+from django_bm25.schema import add_index_concurrently
+
+SHADOW_SUFFIX = '_shadow'
+OLD_SUFFIX = '_old'
+
+
+def get_suffixed_name(name, suffix, connection):
+    max_length = connection.ops.max_name_length() or 63
+    return name[:max_length - len(suffix)] + suffix
+
+
+def get_build_progress(connection, index_name):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total "
+            "FROM pg_catalog.pg_stat_progress_create_index p "
+            "JOIN pg_catalog.pg_class c ON c.oid = p.index_relid "
+            "WHERE c.relname = %s",
+            [index_name],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    phase, blocks_done, blocks_total, tuples_done, tuples_total = row
+    if tuples_total:
+        return phase, tuples_done, tuples_total
+    return phase, blocks_done, blocks_total
+
+
+class BuildMonitor(threading.Thread):
+    """
+    Poll pg_stat_progress_create_index from its own connection while an
+    index is built and call ``progress(phase, done, total, elapsed)``.
+    """
+
+    def __init__(self, using, index_name, progress, interval=1.0):
+        super().__init__(daemon=True)
+        self.using = using
+        self.index_name = index_name
+        self.progress = progress
+        self.interval = interval
+        self.started = time.monotonic()
+        self.stopped = threading.Event()
+
+    def run(self):
+        connection = connections[self.using]
+        try:
+            while not self.stopped.wait(self.interval):
+                state = get_build_progress(connection, self.index_name)
+                phase, done, total = state or ('waiting', 0, 0)
+                self.progress(phase, done, total, time.monotonic() - self.started)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def get_swap_sql(connection, live_name, shadow_name):
+    """
+    Return the statements renaming the shadow index over the live one,
+    which run in a single transaction, and the statement dropping the
+    previous live index afterwards.
+    """
+    quote_name = connection.ops.quote_name
+    old_name = get_suffixed_name(live_name, OLD_SUFFIX, connection)
+    swap = [
+        'ALTER INDEX IF EXISTS %s RENAME TO %s' % (quote_name(live_name), quote_name(old_name)),
+        'ALTER INDEX %s RENAME TO %s' % (quote_name(shadow_name), quote_name(live_name)),
+    ]
+    drop = 'DROP INDEX CONCURRENTLY IF EXISTS %s' % quote_name(old_name)
+    return swap, drop
+
+
+def swap_indexes(connection, live_name, shadow_name):
+    swap, drop = get_swap_sql(connection, live_name, shadow_name)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for sql in swap:
+            cursor.execute(sql)
+    with connection.cursor() as cursor:
+        cursor.execute(drop)
+
+
+def shadow_reindex(model, index, using=None, progress=None, interval=1.0):
+    """
+    Rebuild ``index`` with its current configuration without taking search
+    down: build it concurrently under a shadow name next to the live index,
+    check it is valid and then swap the names in one short transaction.
+    ``progress`` receives ``(phase, done, total, elapsed)`` while building.
+
+    Return the elapsed seconds.
+    """
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+    shadow = index.clone()
+    shadow.name = get_suffixed_name(index.name, SHADOW_SUFFIX, connection)
+
+    started = time.monotonic()
+    monitor = None
+    if progress is not None:
+        monitor = BuildMonitor(using, shadow.name, progress, interval)
+        monitor.start()
+    try:
+        with connection.schema_editor(atomic=False) as editor:
+            add_index_concurrently(editor, model, shadow)
+    finally:
+        if monitor is not None:
+            monitor.stop()
+
+    swap_indexes(connection, index.name, shadow.name)
+    return time.monotonic() - started
+
+
+def shadow_reindex_model(model, names=None, **kwargs):
+    indexes = get_bm25_indexes(model)
+    if names:
+        indexes = [index for index in indexes if index.name in names]
+    return {index.name: shadow_reindex(model, index, **kwargs) for index in indexes}
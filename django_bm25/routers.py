@@ -0,0 +1,191 @@
+import asyncio
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from django.conf import settings
+from django.db import DatabaseError, DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger('django_bm25.routers')
+
+STRATEGIES = ('round_robin', 'least_loaded')
+DEFAULT_MAX_LAG = 5
+DEFAULT_CHECK_INTERVAL = 5
+DEFAULT_PIN_SECONDS = 10
+
+# The replica is in sync when it replayed everything it received, otherwise
+# the lag is the age of the last replayed transaction. Both are null on a
+# primary.
+REPLICA_STATUS_SQL = (
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END, '
+    "(SELECT COUNT(*) FROM pg_stat_activity WHERE state = 'active')"
+)
+
+# Monotonic time until which the searches of the context use the primary.
+_pinned_until = contextvars.ContextVar('bm25_search_pinned_until', default=0.0)
+
+
+def _in_event_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class ReplicaStatus:
+    def __init__(self, lag, load, checked):
+        self.lag = lag
+        self.load = load
+        self.checked = checked
+
+    def __repr__(self):
+        return '<%s: lag=%s load=%s>' % (self.__class__.__name__, self.lag, self.load)
+
+
+class SearchRouter:
+    """
+    Pick the database alias BM25 searches run on: one of the replicas
+    (round-robin, or the one with the fewest active queries) that is less
+    than ``MAX_LAG`` seconds behind, or the primary when none is, when the
+    primary is inside a transaction or after a write pinned the current
+    context (see ``django_bm25.middleware.SearchRouterMiddleware``).
+
+    Configured through the ``BM25_SEARCH_ROUTER`` setting::
+
+        BM25_SEARCH_ROUTER = {
+            'PRIMARY': 'default',
+            'REPLICAS': ['replica1', 'replica2'],
+            'STRATEGY': 'round_robin',
+            'MAX_LAG': 5,
+        }
+    """
+
+    def __init__(self):
+        self._counter = itertools.count()
+        self._statuses = {}
+        self._lock = threading.Lock()
+        self._probing = set()
+
+    def get_setting(self, name, default=None):
+        return getattr(settings, 'BM25_SEARCH_ROUTER', {}).get(name, default)
+
+    @property
+    def enabled(self):
+        return bool(self.get_setting('REPLICAS'))
+
+    @property
+    def primary(self):
+        return self.get_setting('PRIMARY', DEFAULT_DB_ALIAS)
+
+    @property
+    def replicas(self):
+        return list(self.get_setting('REPLICAS', []))
+
+    @property
+    def strategy(self):
+        strategy = self.get_setting('STRATEGY', 'round_robin')
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                'Unknown routing strategy %r, expected one of %s.'
+                % (strategy, ', '.join(STRATEGIES))
+            )
+        return strategy
+
+    @property
+    def pin_seconds(self):
+        return self.get_setting('PIN_SECONDS', DEFAULT_PIN_SECONDS)
+
+    def pin(self, seconds=None):
+        """
+        Send the searches of the current context to the primary for
+        ``PIN_SECONDS``, so that they see its writes.
+        """
+        _pinned_until.set(time.monotonic() + (self.pin_seconds if seconds is None else seconds))
+
+    def is_pinned(self):
+        return _pinned_until.get() > time.monotonic() or connections[self.primary].in_atomic_block
+
+    def get_status(self, alias):
+        interval = self.get_setting('CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+        status = self._statuses.get(alias)
+        if status is not None and time.monotonic() - status.checked < interval:
+            return status
+        if _in_event_loop():
+            # Don't block the event loop on a probe: use the last status, a
+            # replica never probed is skipped, and probe in a thread.
+            self.probe_in_background(alias)
+            return status or ReplicaStatus(None, None, 0)
+        return self.probe(alias)
+
+    def probe_in_background(self, alias):
+        with self._lock:
+            if alias in self._probing:
+                return
+            self._probing.add(alias)
+
+        def run():
+            try:
+                self.probe(alias)
+            finally:
+                with self._lock:
+                    self._probing.discard(alias)
+                connections[alias].close()
+
+        threading.Thread(target=run, name='bm25-replica-probe', daemon=True).start()
+
+    def probe(self, alias):
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute(REPLICA_STATUS_SQL)
+                lag, load = cursor.fetchone()
+            status = ReplicaStatus(float(lag or 0), load, time.monotonic())
+        except DatabaseError:
+            logger.warning('Search replica %s is unavailable', alias, exc_info=True)
+            status = ReplicaStatus(None, None, time.monotonic())
+        with self._lock:
+            self._statuses[alias] = status
+        return status
+
+    def get_available_replicas(self):
+        max_lag = self.get_setting('MAX_LAG', DEFAULT_MAX_LAG)
+        replicas = []
+        for alias in self.replicas:
+            status = self.get_status(alias)
+            if status.lag is not None and status.lag <= max_lag:
+                replicas.append((alias, status))
+        return replicas
+
+    def db_for_search(self, model):
+        """
+        Return the alias a search on ``model`` should use, or None when no
+        replicas are configured.
+        """
+        if not self.enabled:
+            return None
+        if self.is_pinned():
+            return self.primary
+        return self.choose_replica()
+
+    def choose_replica(self):
+        replicas = self.get_available_replicas()
+        if not replicas:
+            return self.primary
+        if self.strategy == 'least_loaded':
+            return min(replicas, key=lambda replica: replica[1].load)[0]
+        with self._lock:
+            position = next(self._counter)
+        return replicas[position % len(replicas)][0]
+
+    def reset(self):
+        with self._lock:
+            self._statuses.clear()
+
+
+search_router = SearchRouter()
+
+
+def pin_search_to_primary(sender, **kwargs):
+    search_router.pin()
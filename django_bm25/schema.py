@@ -0,0 +1,93 @@
+import datetime
+from django.db import DatabaseError
+from django.utils import timezone
+
+BUILT_AT_PREFIX = 'django_bm25 built at '
+
+
+def get_index_validity(connection, name):
+    """
+    Return None when the index doesn't exist, otherwise whether PostgreSQL
+    flags it as valid. A failed CREATE INDEX CONCURRENTLY leaves an invalid
+    index behind.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT i.indisvalid FROM pg_catalog.pg_index i "
+            "JOIN pg_catalog.pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = %s AND pg_catalog.pg_table_is_visible(c.oid)",
+            [name],
+        )
+        row = cursor.fetchone()
+    return None if row is None else row[0]
+
+
+def drop_invalid_index(schema_editor, name):
+    if schema_editor.collect_sql:
+        return
+    if get_index_validity(schema_editor.connection, name) is False:
+        schema_editor.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS %s" % schema_editor.quote_name(name)
+        )
+
+
+def add_index_concurrently(schema_editor, model, index, drop_invalid=True):
+    if drop_invalid:
+        drop_invalid_index(schema_editor, index.name)
+    schema_editor.add_index(model, index, concurrently=True)
+    if schema_editor.collect_sql:
+        return
+    if get_index_validity(schema_editor.connection, index.name) is False:
+        raise DatabaseError(
+            "Index %s was left invalid by CREATE INDEX CONCURRENTLY." % index.name
+        )
+    record_build_time(schema_editor.connection, index.name)
+
+
+def record_build_time(connection, name):
+    """
+    Store the build time in the index comment, PostgreSQL doesn't keep it.
+    Renaming the index keeps its comment.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "COMMENT ON INDEX %s IS %%s" % connection.ops.quote_name(name),
+            [BUILT_AT_PREFIX + timezone.now().isoformat()],
+        )
+
+
+def get_index_stats(connection, name):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_catalog.pg_relation_size(i.oid), "
+            # The table with its TOAST data, but without its indexes (this
+            # one included).
+            "pg_catalog.pg_table_size(t.oid), "
+            "i.reltuples, t.reltuples, "
+            "pg_catalog.obj_description(i.oid, 'pg_class'), "
+            "s.idx_scan "
+            "FROM pg_catalog.pg_class i "
+            "JOIN pg_catalog.pg_index x ON x.indexrelid = i.oid "
+            "JOIN pg_catalog.pg_class t ON t.oid = x.indrelid "
+            "LEFT JOIN pg_catalog.pg_stat_user_indexes s ON s.indexrelid = i.oid "
+            "WHERE i.relname = %s AND pg_catalog.pg_table_is_visible(i.oid)",
+            [name],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    size, table_size, documents, table_rows, comment, scans = row
+    built_at = None
+    if comment and comment.startswith(BUILT_AT_PREFIX):
+        built_at = datetime.datetime.fromisoformat(comment[len(BUILT_AT_PREFIX):])
+    return {
+        'size_bytes': size,
+        'table_size_bytes': table_size,
+        # reltuples is -1 (or 0 before PostgreSQL 14) until the relation
+        # has been vacuumed or analyzed.
+        'documents': max(int(documents), 0),
+        'table_rows': max(int(table_rows), 0),
+        'size_ratio': size / table_size if table_size else 0.0,
+        'scans': scans,
+        'last_built': built_at,
+    }
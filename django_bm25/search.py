@@ -0,0 +1,231 @@
+import decimal
+import functools
+import re
+from django_bm25.indexes import get_bm25_indexes
+
+COMPILE_CACHE_SIZE = 1024
+
+SPECIAL_CHARACTERS = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/\s])')
+
+TEXT_TYPES = ('text', 'json')
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+def escape(value: str):
+    return SPECIAL_CHARACTERS.sub(r'\\\1', value)
+
+
+def format_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, str):
+        return escape(value)
+    raise InvalidQuery('Unsupported query value %r.' % (value,))
+
+
+class QueryNode:
+    """
+    Base of the query AST compiled to ParadeDB query syntax. Nodes are
+    immutable and hashable so that compiled queries can be memoized.
+    """
+    field_types = None
+
+    def get_args(self):
+        raise NotImplementedError
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.get_args() == other.get_args()
+
+    def __hash__(self):
+        return hash((type(self), self.get_args()))
+
+    def __repr__(self):
+        return '%s%r' % (self.__class__.__name__, self.get_args())
+
+    def __and__(self, other):
+        return Boolean(must=[self, other])
+
+    def __or__(self, other):
+        return Boolean(should=[self, other])
+
+    def __invert__(self):
+        return Boolean(must_not=[self])
+
+    def validate(self, fields):
+        """
+        Check the node against ``fields``, a dict of the index field names
+        to their type (text, numeric, boolean or json).
+        """
+        raise NotImplementedError
+
+    def compile(self):
+        raise NotImplementedError
+
+
+class FieldQuery(QueryNode):
+    allowed_types = None
+
+    def __init__(self, field: str, value):
+        self.field = field
+        self.value = value
+
+    def get_args(self):
+        return (self.field, self.value)
+
+    def validate(self, fields):
+        field_type = fields.get(self.field)
+        if field_type is None:
+            raise InvalidQuery('%s is not a field of the BM25 index.' % self.field)
+        if self.allowed_types is not None and field_type not in self.allowed_types:
+            raise InvalidQuery(
+                '%s queries are not supported on %s field %s.'
+                % (self.__class__.__name__, field_type, self.field)
+            )
+
+
+class Term(FieldQuery):
+    def compile(self):
+        return '%s:%s' % (self.field, format_value(self.value))
+
+
+class Phrase(FieldQuery):
+    allowed_types = TEXT_TYPES
+
+    def __init__(self, field: str, value: str, slop=0):
+        super().__init__(field, value)
+        self.slop = slop
+
+    def get_args(self):
+        return (self.field, self.value, self.slop)
+
+    def compile(self):
+        phrase = '%s:"%s"' % (self.field, self.value.replace('\\', '\\\\').replace('"', '\\"'))
+        if self.slop:
+            phrase += '~%d' % self.slop
+        return phrase
+
+
+class Prefix(FieldQuery):
+    allowed_types = TEXT_TYPES
+
+    def compile(self):
+        return '%s:"%s"*' % (self.field, self.value.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+class Fuzzy(FieldQuery):
+    allowed_types = TEXT_TYPES
+
+    def __init__(self, field: str, value: str, distance=1):
+        if distance not in (0, 1, 2):
+            raise InvalidQuery('Fuzzy distance must be 0, 1 or 2.')
+        super().__init__(field, value)
+        self.distance = distance
+
+    def get_args(self):
+        return (self.field, self.value, self.distance)
+
+    def compile(self):
+        return '%s:%s~%d' % (self.field, format_value(self.value), self.distance)
+
+
+class Range(FieldQuery):
+    allowed_types = ('numeric', 'text')
+
+    def __init__(self, field: str, gt=None, gte=None, lt=None, lte=None):
+        if gt is not None and gte is not None or lt is not None and lte is not None:
+            raise InvalidQuery('Use only one of gt/gte and one of lt/lte.')
+        if gt is None and gte is None and lt is None and lte is None:
+            raise InvalidQuery('Range requires at least one bound.')
+        self.field = field
+        self.gt = gt
+        self.gte = gte
+        self.lt = lt
+        self.lte = lte
+
+    def get_args(self):
+        return (self.field, self.gt, self.gte, self.lt, self.lte)
+
+    def compile(self):
+        if self.gte is not None:
+            low = '[%s' % format_value(self.gte)
+        elif self.gt is not None:
+            low = '{%s' % format_value(self.gt)
+        else:
+            low = '{*'
+        if self.lte is not None:
+            high = '%s]' % format_value(self.lte)
+        elif self.lt is not None:
+            high = '%s}' % format_value(self.lt)
+        else:
+            high = '*}'
+        return '%s:%s TO %s' % (self.field, low, high)
+
+
+class Boost(QueryNode):
+    def __init__(self, query: QueryNode, factor):
+        if factor <= 0:
+            raise InvalidQuery('Boost factor must be positive.')
+        self.query = query
+        self.factor = factor
+
+    def get_args(self):
+        return (self.query, self.factor)
+
+    def validate(self, fields):
+        self.query.validate(fields)
+
+    def compile(self):
+        return '(%s)^%s' % (self.query.compile(), self.factor)
+
+
+class Boolean(QueryNode):
+    def __init__(self, must=(), should=(), must_not=()):
+        self.must = tuple(must)
+        self.should = tuple(should)
+        self.must_not = tuple(must_not)
+        if not (self.must or self.should or self.must_not):
+            raise InvalidQuery('Boolean requires at least one clause.')
+
+    def get_args(self):
+        return (self.must, self.should, self.must_not)
+
+    def validate(self, fields):
+        for query in self.must + self.should + self.must_not:
+            query.validate(fields)
+
+    def compile(self):
+        clauses = ['+%s' % query.compile() for query in self.must]
+        clauses += [query.compile() for query in self.should]
+        clauses += ['-%s' % query.compile() for query in self.must_not]
+        return '(%s)' % ' '.join(clauses)
+
+
+def get_index_field_types(model):
+    fields = {}
+    for index in get_bm25_indexes(model):
+        for field, config in index.get_fields_config().items():
+            fields[field] = config['type']
+    return fields
+
+
+@functools.lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile(query, fields):
+    query.validate(dict(fields))
+    return query.compile()
+
+
+def compile_query(query: QueryNode, model=None):
+    """
+    Validate ``query`` against the fields of the Bm25Index of ``model``
+    (when given) and compile it to ParadeDB query syntax. Compiled queries
+    are memoized.
+    """
+    if model is None:
+        return query.compile()
+    fields = tuple(sorted(get_index_field_types(model).items()))
+    return _compile(query, fields)
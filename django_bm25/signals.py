@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Sent by Bm25QuerySet after writes that bypass post_save/post_delete
+# (update(), bulk_create(), bulk_update()) with the model as sender and the
+# database alias as using. The managers of FullTextSearchMixin models use
+# a Bm25QuerySet, see django_bm25.mixins.prepare_search_model().
+post_bulk_write = Signal()
+
+# Sent after a search queryset is evaluated (phase "search") or its hits are
+# hydrated (phase "hydrate") with the model as sender and the query, phase,
+# rows, db_time, hydration_time, sql and explain (the EXPLAIN ANALYZE output
+# of slow searches, otherwise None) arguments.
+search_executed = Signal()
@@ -0,0 +1,108 @@
+import logging
+import time
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, router
+from django_bm25.benchmark import SyntheticCorpus
+from django_bm25.indexes import get_bm25_indexes
+from django_bm25.search import Term
+
+logger = logging.getLogger('django_bm25.warmup')
+
+DEFAULT_QUERY_COUNT = 50
+
+
+def has_pg_prewarm(connection):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_catalog.pg_extension WHERE extname = 'pg_prewarm'")
+        return cursor.fetchone() is not None
+
+
+def prewarm(connection, index, model):
+    """
+    Load the index and its table into shared buffers, return the number of
+    blocks read.
+    """
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_prewarm(%s::regclass) + pg_prewarm(%s::regclass)",
+            [quote_name(index.name), quote_name(model._meta.db_table)],
+        )
+        return cursor.fetchone()[0]
+
+
+def get_warmup_queries(model, index, count=DEFAULT_QUERY_COUNT, using=None):
+    """
+    Representative queries from the ``BM25_WARMUP_QUERIES`` setting (a dict
+    of model labels to query lists), or the most frequent words of the
+    first text field of the index.
+    """
+    configured = getattr(settings, 'BM25_WARMUP_QUERIES', {})
+    if model._meta.label in configured:
+        return list(configured[model._meta.label])[:count]
+    if not index.text_fields:
+        return []
+    field = next(iter(index.text_fields))
+    corpus = SyntheticCorpus.from_queryset(model._default_manager.using(using), field)
+    return [Term(field, word).compile() for word in corpus.words[:count]]
+
+
+def replay(model, queries, using=None):
+    for query in queries:
+        model.search(query, top_k=10, using=using).hits()
+    return len(queries)
+
+
+def warmup_index(model, index, using=None, query_count=DEFAULT_QUERY_COUNT):
+    """
+    Warm ``index`` up with pg_prewarm when the extension is installed,
+    otherwise by replaying representative searches. Return a dict with the
+    ``method`` used, the ``blocks`` or ``queries`` count and the ``seconds``
+    it took.
+    """
+    using = using or router.db_for_read(model)
+    connection = connections[using]
+    started = time.monotonic()
+    if has_pg_prewarm(connection):
+        result = {'method': 'pg_prewarm', 'blocks': prewarm(connection, index, model)}
+    elif hasattr(model, 'search'):
+        queries = get_warmup_queries(model, index, query_count, using)
+        result = {'method': 'replay', 'queries': replay(model, queries, using)}
+    else:
+        result = {'method': None}
+    result.update({
+        'model': model._meta.label,
+        'index': index.name,
+        'seconds': time.monotonic() - started,
+    })
+    return result
+
+
+def warmup_all(models=None, using=None, query_count=DEFAULT_QUERY_COUNT, progress=None):
+    if models is None:
+        models = [model for model in apps.get_models() if get_bm25_indexes(model)]
+    results = []
+    for model in models:
+        for index in get_bm25_indexes(model):
+            result = warmup_index(model, index, using=using, query_count=query_count)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+
+def warmup_in_background():
+    started = time.monotonic()
+    try:
+        results = warmup_all()
+    except Exception:
+        logger.exception('BM25 index warm-up failed')
+        return
+    finally:
+        connections.close_all()
+    logger.info(
+        'Warmed up %d BM25 indexes in %.2fs', len(results), time.monotonic() - started
+    )
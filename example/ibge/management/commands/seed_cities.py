@@ -1,6 +1,7 @@
 import requests
 import json
 from django.core.management.base import BaseCommand
+from django_bm25.loading import bulk_load
 from example.ibge.models import City
 
 
@@ -11,8 +12,8 @@ class Command(BaseCommand):
         )
         json_data = json.loads(response.text)
         data = json_data["data"]
-        for city in data:
-            state = city["Uf"]
-            code = city["Codigo"]
-            name = city["Nome"]
-            City.objects.create(state=state, code=code, name=name)
+        cities = (
+            {"state": city["Uf"], "code": city["Codigo"], "name": city["Nome"]}
+            for city in data
+        )
+        bulk_load(City, cities, drop_index=True)
@@ -0,0 +1,13 @@
+"""
+Settings running the example project and the test suite on SQLite, with
+the FTS5 fallback of django_bm25 instead of ParadeDB.
+"""
+from example.settings import *  # noqa: F401,F403
+from example.settings import BASE_DIR
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
@@ -2,7 +2,21 @@ import unittest
 from django.db import connection
 from django.test import TestCase, modify_settings
 
-@unittest.skipUnless(connection.vendor == "postgresql", "PostgreSQL specific tests")
+postgresql_only = unittest.skipUnless(connection.vendor == "postgresql", "PostgreSQL specific test")
+
+
 @modify_settings(INSTALLED_APPS={"append": "django.contrib.postgres"})
-class PostgreSQLTestCase(TestCase):
+class Bm25TestCase(TestCase):
+    """
+    Tests of features supported by every backend.
+    """
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "PostgreSQL specific tests")
+class PostgreSQLTestCase(Bm25TestCase):
+    pass
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite specific tests")
+class SQLiteTestCase(TestCase):
     pass
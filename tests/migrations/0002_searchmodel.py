@@ -0,0 +1,29 @@
+from django.db import migrations, models
+import django_bm25.indexes
+import django_bm25.mixins
+from django_bm25.operations import Bm25Extension
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0001_initial'),
+    ]
+
+    operations = [
+        Bm25Extension(),
+        migrations.CreateModel(
+            name='SearchModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('category', models.CharField(max_length=32)),
+                ('rating', models.IntegerField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'indexes': [django_bm25.indexes.Bm25Index(boolean_fields={'is_active': {'fast': True}}, json_fields={}, name='idx_search_model', numeric_fields={'rating': {'fast': True}}, text_fields={'title': {'normalizer': 'lowercase', 'tokenizer': 'whitespace'}})],
+            },
+            bases=(django_bm25.mixins.FullTextSearchMixin, models.Model),
+        ),
+    ]
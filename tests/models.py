@@ -1,6 +1,29 @@
 from django.db import models
+from django_bm25.indexes import Bm25Index
+from django_bm25.mixins import FullTextSearchMixin
 
 class CharFieldModel(models.Model):
     app_label = 'app'
     field = models.CharField(max_length=64)
-    
\ No newline at end of file
+
+
+class SearchModel(FullTextSearchMixin, models.Model):
+    title = models.CharField(max_length=255)
+    category = models.CharField(max_length=32)
+    rating = models.IntegerField(default=0)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            Bm25Index(
+                name='idx_search_model',
+                text_fields={
+                    'title': {
+                        'tokenizer': 'whitespace',
+                        'normalizer': 'lowercase'
+                    }
+                },
+                numeric_fields={'rating': {'fast': True}},
+                boolean_fields={'is_active': {'fast': True}},
+            ),
+        ]
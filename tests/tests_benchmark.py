@@ -0,0 +1,92 @@
+from django.db import connection
+from unittest import mock
+from django_bm25.benchmark import Bm25Baseline, QueryMix, SyntheticCorpus, TrigramBaseline, TsvectorBaseline, percentile, summarize, synthetic_records
+from example.ibge.models import City
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class BenchmarkTests(Bm25TestCase):
+    def test_corpus_is_deterministic(self):
+        first = SyntheticCorpus(vocabulary_size=100, seed=1)
+        second = SyntheticCorpus(vocabulary_size=100, seed=1)
+        self.assertEqual(len(first.words), 100)
+        self.assertEqual(first.document(), second.document())
+
+    def test_corpus_skew(self):
+        corpus = SyntheticCorpus(vocabulary_size=100, skew=2, seed=1)
+        terms = corpus.terms(1000)
+        self.assertGreater(terms.count(corpus.words[0]), terms.count(corpus.words[50]))
+
+    def test_corpus_records(self):
+        corpus = SyntheticCorpus(vocabulary_size=10, seed=1, min_length=2, max_length=2)
+        records = list(corpus.records(3, 'title', category='AC'))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(len(records[0]['title'].split()), 2)
+        self.assertEqual(records[0]['category'], 'AC')
+
+    def test_synthetic_records_fill_unique_fields(self):
+        City.objects.create(code='1', name='Rio Branco', state='AC')
+        corpus = SyntheticCorpus(vocabulary_size=10, seed=1)
+        records = list(synthetic_records(City, 'name', corpus, 3))
+        self.assertEqual([record['code'] for record in records], ['0', '2', '3'])
+        self.assertNotIn('state', records[0])
+        self.assertEqual(list(synthetic_records(SearchModel, 'title', corpus, 1))[0].keys(), {'title'})
+        with self.assertRaises(ValueError):
+            synthetic_records(City, 'name', corpus, 10 ** 7)
+
+    def test_query_mix_uses_database(self):
+        corpus = SyntheticCorpus(words=['rio'], seed=1)
+        with mock.patch.object(SearchModel, 'search') as search:
+            QueryMix('single_term', SearchModel, 'title', corpus, using='other')()
+        search.assert_called_once_with('title:rio', using='other', top_k=20)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 99), 0.0)
+
+    def test_summarize(self):
+        summary = summarize([0.001, 0.002, 0.003, 0.004], 2)
+        self.assertEqual(summary['queries'], 4)
+        self.assertEqual(summary['qps'], 2)
+        self.assertAlmostEqual(summary['p50_ms'], 2)
+
+    def test_query_mix(self):
+        SearchModel.objects.create(title='rio branco', category='AC')
+        corpus = SyntheticCorpus(words=['rio'], seed=1)
+        self.assertEqual(len(QueryMix('single_term', SearchModel, 'title', corpus)()), 1)
+        self.assertEqual(QueryMix('deep_page', SearchModel, 'title', corpus)(), [])
+
+    def get_create_sql(self, index):
+        with connection.schema_editor(collect_sql=True) as editor:
+            return str(index.create_sql(SearchModel, editor))
+
+    @postgresql_only
+    def test_baseline_indexes(self):
+        self.assertIn(
+            'USING bm25',
+            self.get_create_sql(Bm25Baseline(SearchModel, 'title').get_index()),
+        )
+        self.assertIn(
+            'USING gin ((to_tsvector(\'simple\'::regconfig, COALESCE("title", \'\'))))',
+            self.get_create_sql(TsvectorBaseline(SearchModel, 'title').get_index()),
+        )
+        self.assertIn(
+            'USING gin ((UPPER("title") gin_trgm_ops))',
+            self.get_create_sql(TrigramBaseline(SearchModel, 'title').get_index()),
+        )
+
+    @postgresql_only
+    def test_baseline_queries(self):
+        SearchModel.objects.create(title='rio branco', category='AC')
+        for baseline in (TsvectorBaseline, TrigramBaseline):
+            with self.subTest(baseline=baseline.name):
+                hits = baseline(SearchModel, 'title').query(['rio', 'grande'])
+                self.assertEqual(len(hits), 1)
+
+    def test_baseline_queries_use_database(self):
+        for baseline in (TsvectorBaseline, TrigramBaseline):
+            with self.subTest(baseline=baseline.name):
+                self.assertEqual(baseline(SearchModel, 'title', using='other').get_queryset().db, 'other')
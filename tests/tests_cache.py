@@ -0,0 +1,114 @@
+import threading
+from django.test import override_settings
+from django_bm25.cache import SearchCache
+from . import Bm25TestCase
+from .models import SearchModel
+
+@override_settings(CACHES={
+    'bm25': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 100},
+    },
+})
+class SearchCacheTests(Bm25TestCase):
+    def setUp(self):
+        self.cache = SearchCache(alias='bm25')
+        self.cache.cache.clear()
+
+    def test_key_depends_on_query_and_page(self):
+        queryset = SearchModel.search("title:rio")
+        key = self.cache.get_key(queryset.order_by('-score')[:20])
+        self.assertEqual(key, self.cache.get_key(queryset.order_by('-score')[:20]))
+        self.assertNotEqual(key, self.cache.get_key(queryset.order_by('-score')[20:40]))
+        self.assertNotEqual(key, self.cache.get_key(SearchModel.search("title:sao")))
+
+    def test_normalized_query_shares_key(self):
+        self.assertEqual(
+            self.cache.get_key(SearchModel.search("title:rio  AND title:grande")),
+            self.cache.get_key(SearchModel.search(" title:rio AND\ttitle:grande ")),
+        )
+
+    def test_key_depends_on_filters(self):
+        queryset = SearchModel.search("title:rio")
+        self.assertNotEqual(
+            self.cache.get_key(queryset),
+            self.cache.get_key(queryset.filter(category="RJ")),
+        )
+
+    def test_invalidate_changes_key(self):
+        queryset = SearchModel.search("title:rio")
+        key = self.cache.get_key(queryset)
+        self.cache.invalidate(SearchModel)
+        self.assertNotEqual(key, self.cache.get_key(queryset))
+
+    def test_get_or_set_and_stats(self):
+        queryset = SearchModel.search("title:rio")
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return [(1, 1.5)]
+
+        self.assertEqual(self.cache.get_or_set(queryset, fetch), [(1, 1.5)])
+        self.assertEqual(self.cache.get_or_set(queryset, fetch), [(1, 1.5)])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            self.cache.stats(SearchModel),
+            {'hits': 1, 'misses': 1, 'hit_ratio': 0.5},
+        )
+
+        self.cache.invalidate(SearchModel)
+        self.cache.get_or_set(queryset, fetch)
+        self.assertEqual(len(calls), 2)
+
+    def wait_for_refresh(self):
+        for thread in threading.enumerate():
+            if thread.name == 'bm25-cache-refresh':
+                thread.join()
+
+    def test_get_or_refresh(self):
+        queryset = SearchModel.search("title:rio")
+        counts = iter([3, 4])
+
+        def fetch():
+            return next(counts)
+
+        self.assertEqual(
+            self.cache.get_or_refresh(queryset, fetch, lambda: 10, 60, kind='count'), (10, False)
+        )
+        self.wait_for_refresh()
+        self.assertEqual(
+            self.cache.get_or_refresh(queryset, fetch, lambda: 10, 60, kind='count'), (3, True)
+        )
+        # Stale entries are returned while they are refreshed.
+        self.assertEqual(
+            self.cache.get_or_refresh(queryset, fetch, lambda: 10, -1, kind='count'), (3, True)
+        )
+        self.wait_for_refresh()
+        self.assertEqual(
+            self.cache.get_or_refresh(queryset, fetch, lambda: 10, 60, kind='count'), (4, True)
+        )
+        self.assertNotEqual(self.cache.get_key(queryset), self.cache.get_key(queryset, 'count'))
+
+    def test_connected_on_first_use(self):
+        queryset = SearchModel.search("title:rio")
+        key = self.cache.get_key(queryset)
+        SearchModel.objects.create(title="rio branco", category="AC")
+        self.assertNotEqual(key, self.cache.get_key(queryset))
+
+    def test_default_manager_writes_invalidate(self):
+        queryset = SearchModel.search("title:rio")
+        key = self.cache.get_key(queryset)
+        SearchModel.objects.update(rating=1)
+        self.assertNotEqual(key, self.cache.get_key(queryset))
+        key = self.cache.get_key(queryset)
+        SearchModel.objects.bulk_create([SearchModel(title="rio claro", category="SP")])
+        self.assertNotEqual(key, self.cache.get_key(queryset))
+
+    def test_invalidated_again_on_commit(self):
+        queryset = SearchModel.search("title:rio")
+        self.cache.get_key(queryset)
+        with self.captureOnCommitCallbacks(execute=True):
+            SearchModel.objects.create(title="rio branco", category="AC")
+            key = self.cache.get_key(queryset)
+        self.assertNotEqual(key, self.cache.get_key(queryset))
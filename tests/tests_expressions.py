@@ -0,0 +1,52 @@
+from django.db.models import Exists, OuterRef
+from django_bm25.expressions import Bm25Match, Bm25Score
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class Bm25ExpressionsTests(Bm25TestCase):
+    def get_sql(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return sql, params
+
+    @postgresql_only
+    def test_match_compiles_to_operator(self):
+        queryset = SearchModel.objects.filter(Bm25Match("title:rio"))
+        sql, params = self.get_sql(queryset)
+        self.assertIn('"tests_searchmodel" @@@ %s', sql)
+        self.assertEqual(params, ("title:rio",))
+
+    @postgresql_only
+    def test_score_compiles_to_rank_bm25(self):
+        queryset = SearchModel.objects.annotate(score=Bm25Score())
+        sql, params = self.get_sql(queryset)
+        self.assertIn('paradedb.rank_bm25("tests_searchmodel".ctid) AS "score"', sql)
+
+    def test_match_composes_with_filter_and_order_by(self):
+        queryset = (
+            SearchModel.objects
+            .filter(Bm25Match("title:rio"), is_active=True)
+            .annotate(score=Bm25Score())
+            .order_by("-score")
+        )
+        sql, params = self.get_sql(queryset)
+        self.assertIn('"tests_searchmodel"."is_active"', sql)
+        self.assertRegex(sql, r'ORDER BY .* DESC$')
+
+    @postgresql_only
+    def test_match_inside_exists_uses_subquery_alias(self):
+        matches = SearchModel.objects.filter(
+            Bm25Match("title:rio"), category=OuterRef("category")
+        )
+        queryset = SearchModel.objects.filter(Exists(matches))
+        sql, params = self.get_sql(queryset)
+        self.assertIn('U0 @@@ %s', sql)
+
+    @postgresql_only
+    def test_search_uses_expressions(self):
+        sql, params = self.get_sql(SearchModel.search("title:rio"))
+        self.assertIn('"tests_searchmodel" @@@ %s', sql)
+        self.assertIn('paradedb.rank_bm25("tests_searchmodel".ctid) AS "score"', sql)
+
+    def test_search_without_score(self):
+        sql, params = self.get_sql(SearchModel.search("title:rio", score=False))
+        self.assertNotIn('rank_bm25', sql)
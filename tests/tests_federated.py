@@ -0,0 +1,28 @@
+from django_bm25.federated import federated_search, federated_search_sql
+from . import Bm25TestCase
+from .models import SearchModel
+
+class FederatedSearchTests(Bm25TestCase):
+    def test_federated_search_sql(self):
+        using, sql, params = federated_search_sql([SearchModel, SearchModel], "title:rio", 10, per_model=5)
+        self.assertEqual(sql.count('UNION ALL'), 1)
+        self.assertEqual(sql.count('DESC LIMIT 5) AS hits)'), 2)
+        self.assertIn('hits.bm25_score / NULLIF(MAX(hits.bm25_score) OVER (), 0) AS score', sql)
+        self.assertTrue(sql.endswith('bm25_federated.pk LIMIT %s'))
+        self.assertEqual(params, (0, "title:rio", 1, "title:rio", 10))
+
+    def test_federated_search_without_models(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(federated_search([], "title:rio"), [])
+
+    def test_federated_search(self):
+        first = SearchModel.objects.create(title="rio branco", category="AC")
+        SearchModel.objects.create(title="sao paulo", category="SP")
+        self.assertEqual(
+            federated_search([SearchModel], "title:rio", hydrate=False),
+            [(SearchModel, first.pk, 1.0)],
+        )
+        with self.assertNumQueries(2):
+            results = federated_search([SearchModel], "title:rio")
+        self.assertEqual(results, [first])
+        self.assertEqual(results[0].score, 1.0)
@@ -1,10 +1,10 @@
 from django.db import connection
 from django.db.models.functions import Lower
 from django_bm25.indexes import Bm25Index
-from . import PostgreSQLTestCase
-from .models import CharFieldModel
+from . import Bm25TestCase, postgresql_only
+from .models import CharFieldModel, SearchModel
 
-class Bm25IndexTests(PostgreSQLTestCase):
+class Bm25IndexTests(Bm25TestCase):
     def get_constraints(self, table):
         """
         Get the indexes on the table using a new cursor.
@@ -247,6 +247,7 @@ class Bm25IndexTests(PostgreSQLTestCase):
     # TODO: add test to validated raises an error when nothing field
     # configuration is provided and, then, implements this feature.
 
+    @postgresql_only
     def test_created_index(self):
         # Ensure the table is there and doesn't have an index.
         self.assertNotIn(
@@ -270,6 +271,36 @@ class Bm25IndexTests(PostgreSQLTestCase):
             index_name, self.get_constraints(CharFieldModel._meta.db_table)
         )
 
+    def test_fields_config(self):
+        index = Bm25Index(
+            name="test_title_bm25",
+            text_fields={"title": {"tokenizer": "whitespace"}},
+            numeric_fields=["rating"],
+        )
+        self.assertEqual(
+            index.get_fields_config(),
+            {
+                "title": {"type": "text", "tokenizer": "whitespace"},
+                "rating": {"type": "numeric"},
+            },
+        )
+
+    @postgresql_only
+    def test_stats(self):
+        index = SearchModel._meta.indexes[0]
+        stats = index.stats(SearchModel)
+        self.assertEqual(stats["name"], "idx_search_model")
+        self.assertEqual(stats["table"], SearchModel._meta.db_table)
+        self.assertEqual(stats["fields"]["title"]["tokenizer"], "whitespace")
+        self.assertGreater(stats["size_bytes"], 0)
+        self.assertGreaterEqual(stats["documents"], 0)
+
+    @postgresql_only
+    def test_stats_missing_index(self):
+        index = Bm25Index(name="missing_bm25", text_fields=["field"])
+        self.assertIsNone(index.stats(CharFieldModel))
+
+    @postgresql_only
     def test_created_index_save_config_text_fields(self):
         # Ensure the table is there and doesn't have an index.
         self.assertNotIn(
@@ -0,0 +1,55 @@
+from django.test import override_settings
+from django_bm25.instrumentation import SearchMetrics, search_metrics
+from django_bm25.signals import search_executed
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class SearchInstrumentationTests(Bm25TestCase):
+    def setUp(self):
+        self.events = []
+        search_executed.connect(self.receiver, sender=SearchModel)
+        self.addCleanup(search_executed.disconnect, self.receiver, sender=SearchModel)
+        search_metrics.reset()
+
+    def receiver(self, sender, **kwargs):
+        self.events.append(kwargs)
+
+    def test_metrics_export_text(self):
+        metrics = SearchMetrics()
+        metrics.record('tests.SearchModel', 'search', 3, 0.5, 0.25, slow=True)
+        metrics.record('tests.SearchModel', 'hydrate', 3, 0.5, 0.25)
+        text = metrics.export_text()
+        self.assertIn('# TYPE django_bm25_searches_total counter', text)
+        self.assertIn('django_bm25_searches_total{model="tests.SearchModel"} 1.0', text)
+        self.assertIn('django_bm25_rows_total{model="tests.SearchModel"} 3.0', text)
+        self.assertIn('django_bm25_db_seconds_total{model="tests.SearchModel"} 1.0', text)
+        self.assertIn('django_bm25_slow_searches_total{model="tests.SearchModel"} 1.0', text)
+
+    def test_lazy_search_sends_nothing(self):
+        SearchModel.search("title:rio")
+        self.assertEqual(self.events, [])
+
+    def test_search_executed(self):
+        SearchModel.objects.create(title="rio branco", category="AC")
+        results = list(SearchModel.search("title:rio", top_k=5))
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event['query'], "title:rio")
+        self.assertEqual(event['phase'], "search")
+        self.assertEqual(event['rows'], len(results))
+        self.assertGreater(event['db_time'], 0)
+        self.assertIsNone(event['explain'])
+        self.assertEqual(search_metrics.collect()[0][2], {'tests.SearchModel': 1})
+
+    def test_two_phase_events(self):
+        obj = SearchModel.objects.create(title="rio branco", category="AC")
+        queryset = SearchModel.search("title:rio")
+        self.assertEqual(queryset.hydrate(queryset.hits()), [obj])
+        self.assertEqual([event['phase'] for event in self.events], ['search', 'hydrate'])
+
+    @override_settings(BM25_SLOW_QUERY_THRESHOLD=0)
+    @postgresql_only
+    def test_slow_search_is_explained(self):
+        with self.assertLogs('django_bm25.search', 'WARNING'):
+            list(SearchModel.search("title:rio"))
+        self.assertIn('Buffers', self.events[0]['explain'])
@@ -0,0 +1,67 @@
+import io
+import tempfile
+from django.core.management import call_command
+from django.db import connection
+from django_bm25.loading import bulk_load, format_copy_rows, get_load_fields, read_csv, read_json_lines
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class BulkLoadTests(Bm25TestCase):
+    def test_load_fields_skip_auto_primary_key(self):
+        self.assertEqual(
+            [field.name for field in get_load_fields(SearchModel)],
+            ['title', 'category', 'rating', 'is_active'],
+        )
+
+    def test_format_copy_rows(self):
+        fields = get_load_fields(SearchModel)
+        buffer, rows = format_copy_rows(fields, [
+            {'title': 'rio\tbranco\\', 'category': 'AC', 'rating': '3', 'is_active': False},
+            {'title': 'rio grande', 'category': 'RS'},
+        ], connection)
+        self.assertEqual(rows, 2)
+        self.assertEqual(
+            buffer.getvalue(),
+            'rio\\tbranco\\\\\tAC\t3\tf\n'
+            'rio grande\tRS\t0\tt\n',
+        )
+
+    def test_readers(self):
+        self.assertEqual(
+            list(read_json_lines(io.StringIO('{"title": "a"}\n\n{"title": "b"}\n'))),
+            [{'title': 'a'}, {'title': 'b'}],
+        )
+        self.assertEqual(
+            list(read_csv(io.StringIO('title,category\na,AC\n'))),
+            [{'title': 'a', 'category': 'AC'}],
+        )
+
+    def test_bulk_load(self):
+        progress = []
+        result = bulk_load(
+            SearchModel,
+            ({'title': 'city %d' % i, 'category': 'AC'} for i in range(5)),
+            batch_size=2,
+            progress=lambda rows, seconds: progress.append(rows),
+        )
+        self.assertEqual(result['rows'], 5)
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual(SearchModel.objects.count(), 5)
+
+    @postgresql_only
+    def test_bulk_load_rebuilds_index(self):
+        bulk_load(SearchModel, [{'title': 'rio branco', 'category': 'AC'}], drop_index=True)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, SearchModel._meta.db_table
+            )
+        self.assertIn('idx_search_model', constraints)
+        self.assertEqual(SearchModel.search('title:rio').count(), 1)
+
+    def test_command(self):
+        stdout = io.StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as file:
+            file.write('{"title": "rio branco", "category": "AC"}\n')
+            file.flush()
+            call_command('bm25_load', 'tests.SearchModel', file.name, stdout=stdout)
+        self.assertIn('Loaded 1 rows', stdout.getvalue())
@@ -0,0 +1,98 @@
+from django_bm25.memory import InMemoryBm25, get_tokenizer
+from django_bm25.search import Boost, InvalidQuery, Phrase, Prefix, Term
+from . import Bm25TestCase
+from .models import SearchModel
+
+class InMemoryBm25Tests(Bm25TestCase):
+    def setUp(self):
+        self.engine = InMemoryBm25(SearchModel)
+        self.engine.add(1, {'title': 'Rio Branco'})
+        self.engine.add(2, {'title': 'Rio Grande rio'})
+        self.engine.add(3, {'title': 'Sao Paulo'})
+
+    def test_tokenizers(self):
+        self.assertEqual(get_tokenizer({})('Rio-Grande do_Sul'), ['rio', 'grande', 'do', 'sul'])
+        self.assertEqual(
+            get_tokenizer({'tokenizer': 'whitespace'})('Rio-Grande Sul'), ['Rio-Grande', 'Sul']
+        )
+        self.assertEqual(
+            get_tokenizer({'tokenizer': 'whitespace', 'normalizer': 'lowercase'})('Rio Sul'),
+            ['rio', 'sul'],
+        )
+        self.assertEqual(get_tokenizer({'tokenizer': 'raw'})('Rio Sul'), ['Rio Sul'])
+        self.assertEqual(
+            get_tokenizer({'tokenizer': {'type': 'ngram', 'min_gram': 2, 'max_gram': 3,
+                                         'prefix_only': True}})('rio'),
+            ['ri', 'rio'],
+        )
+        with self.assertRaises(ValueError):
+            get_tokenizer({'tokenizer': 'en_stem'})
+
+    def test_search_ranks_by_bm25(self):
+        hits = self.engine.search('rio')
+        self.assertEqual([pk for pk, score in hits], [2, 1])
+        self.assertGreater(hits[0][1], hits[1][1])
+        self.assertEqual(self.engine.search('title:PAULO'), [(3, self.engine.search('paulo')[0][1])])
+        self.assertEqual(self.engine.search('nothing'), [])
+
+    def test_search_top_k(self):
+        self.assertEqual(len(self.engine.search('rio', top_k=1)), 1)
+
+    def test_boolean_queries(self):
+        self.assertEqual([pk for pk, score in self.engine.search('+rio -grande')], [1])
+        self.assertEqual([pk for pk, score in self.engine.search('+rio sao')], [2, 1])
+        query = Term('title', 'rio') | Boost(Term('title', 'paulo'), 10)
+        self.assertEqual([pk for pk, score in self.engine.search(query)], [3, 2, 1])
+
+    def test_prefix(self):
+        self.assertEqual(
+            sorted(pk for pk, score in self.engine.search(Prefix('title', 'GR'))), [2]
+        )
+        self.assertEqual(len(self.engine.search(Prefix('title', 'r'))), 2)
+
+    def test_unsupported_queries(self):
+        with self.assertRaises(InvalidQuery):
+            self.engine.search(Phrase('title', 'rio branco'))
+        with self.assertRaises(InvalidQuery):
+            self.engine.search(Term('category', 'RJ'))
+
+    def test_incremental_updates(self):
+        self.engine.add(1, {'title': 'Porto Alegre'})
+        self.engine.remove(3)
+        self.assertEqual(len(self.engine), 2)
+        self.assertEqual([pk for pk, score in self.engine.search('rio')], [2])
+        self.assertEqual(self.engine.search('paulo'), [])
+        self.assertEqual([pk for pk, score in self.engine.search('porto')], [1])
+
+    def test_deleted_documents_are_compacted(self):
+        for pk in range(4, 11):
+            self.engine.add(pk, {'title': 'Porto Alegre'})
+        self.engine.remove(3)
+        self.assertEqual(self.engine.deleted, {2})
+        self.engine.add(1, {'title': 'Rio Claro'})
+        self.engine.remove(4)
+        self.assertEqual(self.engine.deleted, set())
+        self.assertEqual(len(self.engine.pks), 8)
+        self.assertEqual(self.engine.fields['title'].total_length, 17)
+        self.assertNotIn('paulo', self.engine.fields['title'].terms)
+        self.assertEqual([pk for pk, score in self.engine.search('rio')], [2, 1])
+        self.assertEqual([pk for pk, score in self.engine.search('claro')], [1])
+
+    def test_signals_refresh_on_commit(self):
+        self.engine.connect()
+        self.addCleanup(self.engine.disconnect)
+        with self.captureOnCommitCallbacks(execute=True):
+            obj = SearchModel.objects.create(title='Rio Claro', category='SP')
+        self.assertEqual(self.engine.search('claro')[0][0], obj.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.delete()
+        self.assertEqual(self.engine.search('claro'), [])
+
+    def test_default_manager_updates_reload_on_commit(self):
+        obj = SearchModel.objects.create(title='Rio Claro', category='SP')
+        self.engine.connect()
+        self.addCleanup(self.engine.disconnect)
+        with self.captureOnCommitCallbacks(execute=True):
+            SearchModel.objects.filter(pk=obj.pk).update(title='Porto Alegre')
+        self.assertEqual(self.engine.search('claro'), [])
+        self.assertEqual(self.engine.search('porto')[0][0], obj.pk)
@@ -0,0 +1,119 @@
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class FullTextSearchMixinTests(Bm25TestCase):
+    def get_sql(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return sql, params
+
+    def test_search_top_k_orders_by_score_with_limit(self):
+        sql, params = self.get_sql(SearchModel.search("title:rio", top_k=20))
+        self.assertRegex(sql, r'ORDER BY \S+ DESC LIMIT 20$')
+        self.assertEqual(params, ("title:rio",))
+
+    @postgresql_only
+    def test_search_top_k_without_score(self):
+        sql, params = self.get_sql(
+            SearchModel.search("title:rio", score=False, top_k=5)
+        )
+        self.assertNotIn('AS "score"', sql)
+        self.assertIn(
+            'ORDER BY paradedb.rank_bm25("tests_searchmodel".ctid) DESC LIMIT 5',
+            sql,
+        )
+
+    def test_search_without_top_k_is_unordered(self):
+        sql, params = self.get_sql(SearchModel.search("title:rio"))
+        self.assertNotIn('ORDER BY', sql)
+        self.assertNotIn('LIMIT', sql)
+
+    @postgresql_only
+    def test_search_many_sql(self):
+        using, sql, params = SearchModel.search_many_sql(["title:rio", "title:sao  paulo"], 5)
+        self.assertIn('FROM (VALUES (%s, %s), (%s, %s)) AS bm25_queries', sql)
+        self.assertIn('CROSS JOIN LATERAL (SELECT', sql)
+        self.assertIn('"tests_searchmodel" @@@ (bm25_queries.query)', sql)
+        self.assertIn('DESC LIMIT 5) AS hits (pk, score)', sql)
+        self.assertEqual(params, (0, "title:rio", 1, "title:sao paulo"))
+
+    def test_search_many_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(SearchModel.search_many([]), [])
+
+    @postgresql_only
+    def test_search_many(self):
+        rio = SearchModel.objects.create(title="rio branco", category="AC")
+        results = SearchModel.search_many(["title:rio", "title:nothing"], top_k=5)
+        self.assertEqual(results, [[rio], []])
+
+    @postgresql_only
+    def test_search_min_score(self):
+        sql, params = self.get_sql(SearchModel.search("title:rio", min_score=1.5))
+        self.assertIn('paradedb.rank_bm25("tests_searchmodel".ctid) >= %s', sql)
+        self.assertEqual(params, ("title:rio", 1.5))
+
+    @postgresql_only
+    def test_search_collapse_sql(self):
+        sql, params = self.get_sql(
+            SearchModel.search("title:rio", collapse_by="category", per_group=2, top_k=10)
+        )
+        self.assertIn(
+            'ROW_NUMBER() OVER (PARTITION BY "tests_searchmodel"."category" '
+            'ORDER BY paradedb.rank_bm25("tests_searchmodel".ctid) DESC',
+            sql,
+        )
+        self.assertIn('"collapse_rank" <= %s', sql)
+        self.assertRegex(sql, r'LIMIT 10$')
+        self.assertEqual(params, ("title:rio", 2))
+
+    def test_search_per_group_requires_collapse_by(self):
+        with self.assertRaises(ValueError):
+            SearchModel.search("title:rio", per_group=2)
+        with self.assertRaises(ValueError):
+            SearchModel.search("title:rio", collapse_by="category", per_group=0)
+
+    def test_search_collapse(self):
+        SearchModel.objects.create(title="rio branco", category="AC")
+        SearchModel.objects.create(title="rio grande", category="RS")
+        SearchModel.objects.create(title="rio grande rio", category="RS")
+        results = list(SearchModel.search("title:rio", collapse_by="category", top_k=10))
+        self.assertEqual(sorted(obj.category for obj in results), ["AC", "RS"])
+        self.assertTrue(all(obj.collapse_rank == 1 for obj in results))
+
+    @postgresql_only
+    def test_search_hybrid_sql(self):
+        using, sql, params = SearchModel.search_hybrid_sql(
+            "title:rio", [0.5, 1], "title", k=30, weights=(1, 2), candidates=50
+        )
+        self.assertIn('"title" <=> CAST(%s AS vector) AS distance', sql)
+        self.assertIn('ORDER BY distance LIMIT %s', sql)
+        self.assertIn('CAST(%s AS double precision) / (%s + rank)', sql)
+        self.assertIn('ORDER BY 2 DESC LIMIT 50) AS hits (pk, score)', sql)
+        self.assertEqual(params, ("title:rio", "[0.5,1.0]", 50, 1, 30, 2, 30))
+
+        using, sql, params = SearchModel.search_hybrid_sql(
+            "title:rio", [0.5], "title", fusion="weighted", distance="l2"
+        )
+        self.assertIn('"title" <-> CAST(%s AS vector)', sql)
+        self.assertIn('MAX(distance) OVER () - distance', sql)
+        self.assertEqual(params[-2:], (1.0, 1.0))
+
+    def test_search_hybrid_invalid_options(self):
+        with self.assertRaises(ValueError):
+            SearchModel.search_hybrid_sql("title:rio", [0.5], "title", fusion="max")
+        with self.assertRaises(ValueError):
+            SearchModel.search_hybrid_sql("title:rio", [0.5], "title", distance="hamming")
+
+    @postgresql_only
+    def test_search_hybrid_queryset(self):
+        queryset = SearchModel.search_hybrid("title:rio", [0.5], "title", top_k=10)
+        sql, params = self.get_sql(queryset)
+        self.assertIn('"tests_searchmodel".bm25_hybrid_score AS "score"', sql)
+        self.assertIn(') "tests_searchmodel" ORDER BY', sql)
+        self.assertRegex(sql, r'LIMIT 10$')
+
+        subquery = SearchModel.objects.filter(
+            pk__in=SearchModel.search_hybrid("title:rio", [0.5], "title").values('pk')
+        )
+        sql, params = self.get_sql(subquery)
+        self.assertIn('bm25_fused.pk) U0)', sql)
@@ -0,0 +1,107 @@
+from django.db import IntegrityError, NotSupportedError, connection
+from django.db.models import Index
+from django.db.migrations.state import ProjectState
+from django.apps import apps
+from django.test import TransactionTestCase
+from django_bm25.indexes import Bm25Index
+from django_bm25.operations import AddBm25IndexConcurrently, RemoveBm25IndexConcurrently
+from django_bm25.schema import get_index_validity
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class Bm25IndexConcurrentlyTests(Bm25TestCase):
+    def get_index(self):
+        return Bm25Index(
+            name='idx_search_model_concurrently',
+            text_fields={'title': {'tokenizer': 'whitespace'}},
+        )
+
+    def test_requires_bm25_index(self):
+        with self.assertRaises(TypeError):
+            AddBm25IndexConcurrently('searchmodel', Index(fields=['title'], name='idx'))
+
+    def test_add_deconstruct(self):
+        index = self.get_index()
+        operation = AddBm25IndexConcurrently('searchmodel', index)
+        name, args, kwargs = operation.deconstruct()
+        self.assertEqual(name, 'AddBm25IndexConcurrently')
+        self.assertEqual(kwargs, {'model_name': 'searchmodel', 'index': index})
+
+        operation = AddBm25IndexConcurrently('searchmodel', index, drop_invalid=False)
+        name, args, kwargs = operation.deconstruct()
+        self.assertEqual(kwargs['drop_invalid'], False)
+
+    def test_remove_deconstruct(self):
+        operation = RemoveBm25IndexConcurrently('searchmodel', 'idx_search_model')
+        name, args, kwargs = operation.deconstruct()
+        self.assertEqual(name, 'RemoveBm25IndexConcurrently')
+        self.assertEqual(kwargs, {'model_name': 'searchmodel', 'name': 'idx_search_model'})
+
+    def test_describe(self):
+        operation = AddBm25IndexConcurrently('searchmodel', self.get_index())
+        self.assertEqual(
+            operation.describe(),
+            'Concurrently create BM25 index idx_search_model_concurrently on model searchmodel',
+        )
+
+    def test_add_in_transaction(self):
+        operation = AddBm25IndexConcurrently('searchmodel', self.get_index())
+        project_state = ProjectState.from_apps(apps)
+        new_state = project_state.clone()
+        operation.state_forwards('tests', new_state)
+        with self.assertRaises(NotSupportedError):
+            with connection.schema_editor(atomic=True) as editor:
+                operation.database_forwards('tests', editor, project_state, new_state)
+
+    @postgresql_only
+    def test_add_collect_sql(self):
+        operation = AddBm25IndexConcurrently('searchmodel', self.get_index())
+        project_state = ProjectState.from_apps(apps)
+        new_state = project_state.clone()
+        operation.state_forwards('tests', new_state)
+        with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            operation.database_forwards('tests', editor, project_state, new_state)
+        self.assertEqual(len(editor.collected_sql), 1)
+        self.assertIn('CREATE INDEX CONCURRENTLY "idx_search_model_concurrently"', editor.collected_sql[0])
+        self.assertIn('USING bm25', editor.collected_sql[0])
+        self.assertIn(
+            'WITH (text_fields=\'{"title": {"tokenizer": "whitespace"}}\')',
+            editor.collected_sql[0],
+        )
+
+
+@postgresql_only
+class Bm25IndexConcurrentlyBuildTests(TransactionTestCase):
+    available_apps = ['tests']
+
+    def test_add_replaces_invalid_index(self):
+        index = Bm25Index(
+            name='idx_search_model_concurrently',
+            text_fields={'title': {'tokenizer': 'whitespace'}},
+        )
+        SearchModel.objects.create(title='rio branco', category='AC')
+        SearchModel.objects.create(title='rio branco', category='RS')
+        # A failed concurrent build leaves an invalid index with the name.
+        with self.assertRaises(IntegrityError), connection.cursor() as cursor:
+            cursor.execute('CREATE UNIQUE INDEX CONCURRENTLY %s ON %s (title)' % (
+                connection.ops.quote_name(index.name),
+                connection.ops.quote_name(SearchModel._meta.db_table),
+            ))
+        self.assertIs(get_index_validity(connection, index.name), False)
+
+        operation = AddBm25IndexConcurrently('searchmodel', index)
+        project_state = ProjectState.from_apps(apps)
+        new_state = project_state.clone()
+        operation.state_forwards('tests', new_state)
+        with connection.schema_editor(atomic=False) as editor:
+            operation.database_forwards('tests', editor, project_state, new_state)
+        try:
+            self.assertIs(get_index_validity(connection, index.name), True)
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(
+                    cursor, SearchModel._meta.db_table
+                )
+            self.assertEqual(constraints[index.name]['type'], 'bm25')
+        finally:
+            with connection.schema_editor(atomic=False) as editor:
+                editor.remove_index(SearchModel, index, concurrently=True)
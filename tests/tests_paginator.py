@@ -0,0 +1,61 @@
+from django.core.paginator import PageNotAnInteger
+from django_bm25.expressions import Bm25SearchAfter
+from django_bm25.paginator import Bm25Paginator, decode_cursor, encode_cursor
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class Bm25PaginatorTests(Bm25TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(1.5, 42)
+        self.assertNotIn('42', cursor)
+        self.assertEqual(decode_cursor(cursor), (1.5, 42))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(PageNotAnInteger):
+            decode_cursor('not-a-cursor')
+
+    def test_paginator_orders_by_score_and_pk(self):
+        paginator = Bm25Paginator(SearchModel.search("title:rio"), 20)
+        sql, params = paginator.object_list.query.sql_with_params()
+        self.assertRegex(sql, r'ORDER BY \S+ DESC, "tests_searchmodel"."id" DESC$')
+
+    def test_paginator_annotates_score(self):
+        paginator = Bm25Paginator(SearchModel.search("title:rio", score=False), 20)
+        self.assertIn('score', paginator.object_list.query.annotations)
+
+    def test_cursor_page_uses_keyset_condition(self):
+        paginator = Bm25Paginator(SearchModel.search("title:rio"), 20)
+        cursor = encode_cursor(0.5, 10)
+        with self.assertNumQueries(1):
+            page = paginator.page(cursor)
+        self.assertEqual(list(page), [])
+        self.assertIsNone(page.next_cursor)
+        self.assertFalse(page.has_next())
+
+    @postgresql_only
+    def test_cursor_page_sql(self):
+        paginator = Bm25Paginator(SearchModel.search("title:rio"), 20)
+        score, pk = decode_cursor(encode_cursor(0.5, 10))
+        queryset = paginator.object_list.filter(Bm25SearchAfter(score, pk))
+        sql, params = queryset[:21].query.sql_with_params()
+        self.assertIn(
+            '(paradedb.rank_bm25("tests_searchmodel".ctid), "tests_searchmodel"."id")'
+            ' < (CAST(%s AS real), %s)',
+            sql,
+        )
+        self.assertEqual(params[-2:], (0.5, 10))
+        self.assertNotIn('OFFSET', sql)
+
+    def test_paginator_estimated_count(self):
+        for title in ["rio branco", "rio grande", "rio claro"]:
+            SearchModel.objects.create(title=title, category="BR")
+        paginator = Bm25Paginator(
+            SearchModel.search("title:rio"), 1, count_strategy="capped", count_cap=2
+        )
+        self.assertEqual(paginator.count, 2)
+        self.assertFalse(paginator.count_is_exact)
+        self.assertEqual(paginator.num_pages, 2)
+        page = paginator.page(2)
+        self.assertFalse(page.has_next())
+        self.assertIsNotNone(page.next_cursor)
+        self.assertEqual(len(paginator.page(page.next_cursor)), 1)
@@ -0,0 +1,90 @@
+from django.db.models import F, Q
+from django_bm25.pushdown import get_pushdown_fields, split_filters
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class FilterPushdownTests(Bm25TestCase):
+    def get_index(self):
+        return SearchModel._meta.indexes[0]
+
+    def test_pushdown_fields(self):
+        self.assertEqual(
+            get_pushdown_fields(self.get_index()),
+            {'rating': 'numeric', 'is_active': 'boolean'},
+        )
+
+    def test_split_supported_lookups(self):
+        clauses, remainder = split_filters(self.get_index(), Q(
+            rating__gte=3, rating__lt=5, is_active=True
+        ))
+        self.assertEqual(
+            sorted(clauses),
+            ['is_active:true', 'rating:[3 TO *}', 'rating:{* TO 5}'],
+        )
+        self.assertEqual(remainder, Q())
+
+    def test_split_exact_in_and_range(self):
+        clauses, remainder = split_filters(self.get_index(), {
+            'rating': 4,
+            'rating__in': [1, 2],
+            'rating__range': (1, 10),
+        })
+        self.assertEqual(sorted(clauses), [
+            '(rating:[1 TO 1] OR rating:[2 TO 2])',
+            'rating:[1 TO 10]',
+            'rating:[4 TO 4]',
+        ])
+
+    def test_unsupported_predicates_stay_in_sql(self):
+        clauses, remainder = split_filters(self.get_index(), Q(
+            Q(category='RJ'), rating__gt=F('id'), is_active=True
+        ))
+        self.assertEqual(clauses, ['is_active:true'])
+        self.assertEqual(remainder, Q(category='RJ') & Q(('rating__gt', F('id'))))
+
+    def test_or_is_pushed_down_as_a_whole(self):
+        clauses, remainder = split_filters(
+            self.get_index(), Q(rating__gt=4) | Q(is_active=False)
+        )
+        self.assertEqual(clauses, ['(rating:{4 TO *} OR is_active:false)'])
+        self.assertEqual(remainder, Q())
+
+        filters = Q(rating__gt=4) | Q(category='RJ')
+        clauses, remainder = split_filters(self.get_index(), filters)
+        self.assertEqual(clauses, [])
+        self.assertEqual(remainder, filters)
+
+    def test_xor_stays_in_sql(self):
+        filters = Q(rating__gt=4) ^ Q(is_active=False)
+        clauses, remainder = split_filters(self.get_index(), filters)
+        self.assertEqual(clauses, [])
+        self.assertEqual(remainder, filters)
+
+        clauses, remainder = split_filters(self.get_index(), Q(filters, is_active=True))
+        self.assertEqual(clauses, ['is_active:true'])
+        self.assertEqual(remainder, filters)
+
+    def test_negated_stays_in_sql(self):
+        filters = ~Q(rating=4)
+        clauses, remainder = split_filters(self.get_index(), filters)
+        self.assertEqual(clauses, [])
+        self.assertEqual(remainder, filters)
+
+    @postgresql_only
+    def test_search_with_filters(self):
+        queryset = SearchModel.search('title:rio', filters=Q(rating__gte=3, category='RJ'))
+        sql, params = queryset.query.sql_with_params()
+        self.assertEqual(params[0], '(title:rio) AND (rating:[3 TO *})^0')
+        where = sql.split(' WHERE ')[1]
+        self.assertIn('"tests_searchmodel"."category" = %s', where)
+        self.assertNotIn('"tests_searchmodel"."rating"', where)
+
+    @postgresql_only
+    def test_filters_do_not_change_score(self):
+        SearchModel.objects.create(title="rio branco", category="AC", rating=4, is_active=True)
+        SearchModel.objects.create(title="rio rio grande", category="RS", rating=5, is_active=True)
+        filters = {'rating__gte': 3, 'is_active': True}
+        self.assertEqual(
+            SearchModel.search('title:rio', filters=filters, top_k=10).hits(),
+            SearchModel.search('title:rio', top_k=10).hits(),
+        )
@@ -0,0 +1,129 @@
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_bm25.querysets import Bm25Count, Bm25QuerySet, agather_hits
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+class Bm25QuerySetTests(Bm25TestCase):
+    def test_search_returns_bm25_queryset(self):
+        self.assertIsInstance(SearchModel.search("title:rio"), Bm25QuerySet)
+        self.assertIsInstance(SearchModel.search("title:rio", top_k=10), Bm25QuerySet)
+
+    @postgresql_only
+    def test_hits_selects_only_pk_and_score(self):
+        queryset = SearchModel.search("title:rio", top_k=10)._with_score()
+        sql, params = queryset.values_list('pk', 'score').query.sql_with_params()
+        self.assertTrue(sql.startswith(
+            'SELECT "tests_searchmodel"."id" AS "pk", '
+            'paradedb.rank_bm25("tests_searchmodel".ctid) AS "score" FROM'
+        ))
+        self.assertNotIn('"tests_searchmodel"."title"', sql)
+
+    def test_hydrate_without_hits(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(SearchModel.search("title:rio").hydrate([]), [])
+
+    def test_hydrate_keeps_rank_order(self):
+        first = SearchModel.objects.create(title="rio branco", category="AC")
+        second = SearchModel.objects.create(title="rio grande", category="RS")
+        queryset = SearchModel.search("title:rio")
+        with self.assertNumQueries(1):
+            objects = queryset.hydrate([(second.pk, 2.0), (first.pk, 1.0)])
+        self.assertEqual(objects, [second, first])
+        self.assertEqual([obj.score for obj in objects], [2.0, 1.0])
+
+    def test_hydrate_in_batches(self):
+        first = SearchModel.objects.create(title="rio branco", category="AC")
+        second = SearchModel.objects.create(title="rio grande", category="RS")
+        queryset = SearchModel.search("title:rio")
+        with self.assertNumQueries(2):
+            objects = queryset.hydrate([(first.pk, 2.0), (second.pk, 1.0)], batch_size=1)
+        self.assertEqual(objects, [first, second])
+
+    async def test_asearch_without_matches(self):
+        self.assertEqual(await SearchModel.asearch("title:rio", top_k=5), [])
+
+    async def test_aiter_hits_without_matches(self):
+        hits = [hit async for hit in SearchModel.search("title:rio").aiter_hits()]
+        self.assertEqual(hits, [])
+
+    async def test_aiter_hits_in_chunks(self):
+        for title in ["rio branco", "rio grande", "rio claro"]:
+            await SearchModel.objects.acreate(title=title, category="RS")
+        queryset = SearchModel.search("title:rio", top_k=5)
+        hits = [hit async for hit in queryset.aiter_hits(chunk_size=2)]
+        self.assertEqual(hits, await sync_to_async(queryset.hits)())
+
+    async def test_asearch(self):
+        rio = await SearchModel.objects.acreate(title="rio branco", category="AC")
+        await SearchModel.objects.acreate(title="sao paulo", category="SP")
+        self.assertEqual(await SearchModel.asearch("title:rio", top_k=5), [rio])
+
+    async def test_agather_hits(self):
+        results = await agather_hits(
+            SearchModel.search("title:rio", top_k=5),
+            SearchModel.search("title:sao", top_k=5),
+        )
+        self.assertEqual(results, [[], []])
+
+    @postgresql_only
+    def test_facets_requires_index_field(self):
+        with self.assertRaises(ValueError):
+            SearchModel.search("title:rio").facets(["category"])
+        with self.assertRaises(ValueError):
+            SearchModel.search("title:rio").facets(["title"])
+
+    def test_facet_fields_reject_json_fields(self):
+        index = SearchModel._meta.indexes[0]
+        with mock.patch.object(index, "json_fields", {"title": {}}):
+            with self.assertRaises(ValueError):
+                SearchModel.search("title:rio").get_facet_fields(["title"])
+
+    @postgresql_only
+    def test_facets(self):
+        SearchModel.objects.create(title="rio branco", category="AC", rating=3)
+        SearchModel.objects.create(title="rio grande", category="RS", rating=3, is_active=False)
+        SearchModel.objects.create(title="rio claro", category="SP", rating=5)
+        SearchModel.objects.create(title="sao paulo", category="SP", rating=5)
+        with CaptureQueriesContext(connection) as queries:
+            facets = SearchModel.search("title:rio", top_k=2).facets(["rating", "is_active"])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('bm25_matches (bm25_pk, bm25_facet_0, bm25_facet_1, score)', queries[0]['sql'])
+        self.assertEqual(len(facets.hits), 2)
+        self.assertTrue(all(hit.title.startswith("rio") for hit in facets.hits))
+        self.assertGreaterEqual(facets.hits[0].score, facets.hits[1].score)
+        self.assertEqual(facets.counts, {
+            "rating": [(3, 2), (5, 1)],
+            "is_active": [(True, 2), (False, 1)],
+        })
+
+    @postgresql_only
+    def test_facets_without_matches(self):
+        facets = SearchModel.search("title:nothing").facets(["rating"], top_k=10)
+        self.assertEqual(facets.hits, [])
+        self.assertEqual(facets.counts, {"rating": []})
+
+    def test_estimated_count_strategy(self):
+        with self.assertRaises(ValueError):
+            SearchModel.search("title:rio").estimated_count("exact")
+
+    def test_estimated_count_capped(self):
+        for title in ["rio branco", "rio grande", "rio claro"]:
+            SearchModel.objects.create(title=title, category="BR")
+        queryset = SearchModel.search("title:rio")
+        with self.assertNumQueries(1):
+            count = queryset.estimated_count(cap=2)
+        self.assertEqual((count, count.exact), (2, False))
+        count = queryset.estimated_count(cap=10)
+        self.assertEqual((count, count.exact), (3, True))
+        count = SearchModel.search("title:rio", top_k=1).estimated_count(cap=2)
+        self.assertEqual((count, count.exact), (1, True))
+
+    @postgresql_only
+    def test_estimated_count_planner(self):
+        with self.assertNumQueries(1):
+            count = SearchModel.search("title:rio").estimated_count("planner")
+        self.assertIsInstance(count, Bm25Count)
+        self.assertFalse(count.exact)
@@ -0,0 +1,63 @@
+from django.apps import apps
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from django_bm25.indexes import Bm25Index
+from django_bm25.operations import ReindexBm25Concurrently
+from django_bm25.reindex import get_suffixed_name, get_swap_sql
+from . import Bm25TestCase, postgresql_only
+
+class ShadowReindexTests(Bm25TestCase):
+    def get_index(self):
+        return Bm25Index(
+            name='idx_search_model',
+            text_fields={'title': {'tokenizer': 'whitespace', 'normalizer': 'raw'}},
+        )
+
+    def test_suffixed_name_fits_identifier_length(self):
+        self.assertEqual(get_suffixed_name('idx', '_shadow', connection), 'idx_shadow')
+        name = get_suffixed_name('i' * 63, '_shadow', connection)
+        self.assertEqual(len(name), 63)
+        self.assertTrue(name.endswith('_shadow'))
+
+    def test_swap_sql(self):
+        swap, drop = get_swap_sql(connection, 'idx', 'idx_shadow')
+        self.assertEqual(swap, [
+            'ALTER INDEX IF EXISTS "idx" RENAME TO "idx_old"',
+            'ALTER INDEX "idx_shadow" RENAME TO "idx"',
+        ])
+        self.assertEqual(drop, 'DROP INDEX CONCURRENTLY IF EXISTS "idx_old"')
+
+    def test_operation_deconstruct(self):
+        index = self.get_index()
+        operation = ReindexBm25Concurrently('searchmodel', index)
+        name, args, kwargs = operation.deconstruct()
+        self.assertEqual(name, 'ReindexBm25Concurrently')
+        self.assertEqual(args, [])
+        self.assertEqual(kwargs, {'model_name': 'searchmodel', 'index': index})
+
+    def test_operation_state_forwards(self):
+        project_state = ProjectState.from_apps(apps)
+        operation = ReindexBm25Concurrently('searchmodel', self.get_index())
+        operation.state_forwards('tests', project_state)
+        index = project_state.models['tests', 'searchmodel'].get_index_by_name('idx_search_model')
+        self.assertEqual(index.text_fields['title']['normalizer'], 'raw')
+        self.assertEqual(len(project_state.models['tests', 'searchmodel'].options['indexes']), 1)
+
+    @postgresql_only
+    def test_operation_collect_sql(self):
+        project_state = ProjectState.from_apps(apps)
+        new_state = project_state.clone()
+        operation = ReindexBm25Concurrently('searchmodel', self.get_index())
+        operation.state_forwards('tests', new_state)
+        with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            operation.database_forwards('tests', editor, project_state, new_state)
+        self.assertEqual(len(editor.collected_sql), 6)
+        self.assertTrue(editor.collected_sql[0].startswith(
+            'CREATE INDEX CONCURRENTLY "idx_search_model_shadow"'
+        ))
+        self.assertEqual(editor.collected_sql[1:5], [
+            'BEGIN;',
+            'ALTER INDEX IF EXISTS "idx_search_model" RENAME TO "idx_search_model_old";',
+            'ALTER INDEX "idx_search_model_shadow" RENAME TO "idx_search_model";',
+            'COMMIT;',
+        ])
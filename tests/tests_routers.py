@@ -0,0 +1,113 @@
+import asyncio
+import contextvars
+import time
+from unittest import mock
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django_bm25.middleware import PIN_COOKIE, SearchRouterMiddleware
+from django_bm25.federated import federated_search_sql
+from django_bm25.routers import ReplicaStatus, SearchRouter, _pinned_until, search_router
+from . import Bm25TestCase
+from .models import SearchModel
+
+@override_settings(BM25_SEARCH_ROUTER={
+    'REPLICAS': ['replica1', 'replica2'],
+    'MAX_LAG': 5,
+    'CHECK_INTERVAL': 60,
+})
+class SearchRouterTests(Bm25TestCase):
+    def setUp(self):
+        self.router = SearchRouter()
+        self.set_status('replica1', lag=0, load=3)
+        self.set_status('replica2', lag=0, load=1)
+
+    def set_status(self, alias, lag, load):
+        self.router._statuses[alias] = ReplicaStatus(lag, load, time.monotonic())
+
+    def test_disabled_without_replicas(self):
+        with self.settings(BM25_SEARCH_ROUTER={}):
+            self.assertIsNone(self.router.db_for_search(SearchModel))
+
+    def test_round_robin(self):
+        aliases = [self.router.choose_replica() for i in range(4)]
+        self.assertEqual(aliases, ['replica1', 'replica2', 'replica1', 'replica2'])
+
+    def test_least_loaded(self):
+        with self.settings(BM25_SEARCH_ROUTER={
+            'REPLICAS': ['replica1', 'replica2'], 'STRATEGY': 'least_loaded', 'CHECK_INTERVAL': 60,
+        }):
+            self.assertEqual(self.router.choose_replica(), 'replica2')
+            self.assertEqual(self.router.choose_replica(), 'replica2')
+
+    def test_invalid_strategy(self):
+        with self.settings(BM25_SEARCH_ROUTER={
+            'REPLICAS': ['replica1'], 'STRATEGY': 'random', 'CHECK_INTERVAL': 60,
+        }):
+            with self.assertRaises(ValueError):
+                self.router.choose_replica()
+
+    def test_lagging_replicas_fall_back_to_primary(self):
+        self.set_status('replica1', lag=10, load=0)
+        self.assertEqual(self.router.choose_replica(), 'replica2')
+        self.set_status('replica2', lag=None, load=None)
+        self.assertEqual(self.router.choose_replica(), 'default')
+
+    def test_transaction_uses_primary(self):
+        # Test cases run inside a transaction on the primary.
+        self.assertEqual(self.router.db_for_search(SearchModel), 'default')
+
+    def test_pin(self):
+        def search_after_write():
+            self.router.pin()
+            return self.router.is_pinned()
+
+        self.assertTrue(contextvars.copy_context().run(search_after_write))
+        self.assertEqual(_pinned_until.get(), 0.0)
+
+    def test_pin_expires(self):
+        def search_after_expiry():
+            self.router.pin(seconds=-1)
+            return self.router.is_pinned()
+
+        with mock.patch('django_bm25.routers.connections') as connections:
+            connections.__getitem__.return_value.in_atomic_block = False
+            self.assertFalse(contextvars.copy_context().run(search_after_expiry))
+
+    def test_no_probe_in_event_loop(self):
+        async def get_status():
+            return self.router.get_status('replica3')
+
+        with mock.patch.object(self.router, 'probe_in_background') as probe_in_background:
+            status = asyncio.run(get_status())
+        probe_in_background.assert_called_once_with('replica3')
+        self.assertIsNone(status.lag)
+
+    def test_federated_search_routes_once(self):
+        with mock.patch.object(search_router, 'db_for_search', return_value='default') as db_for_search:
+            using, sql, params = federated_search_sql([SearchModel, SearchModel], "title:rio", 10)
+        db_for_search.assert_called_once_with(SearchModel)
+        self.assertEqual(using, 'default')
+
+    def test_middleware_sets_pin_cookie(self):
+        def write_view(request):
+            self.router.pin()
+            return HttpResponse()
+
+        response = SearchRouterMiddleware(write_view)(RequestFactory().post('/'))
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(_pinned_until.get(), 0.0)
+
+        seen = []
+
+        def read_view(request):
+            seen.append(self.router.is_pinned())
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        with mock.patch('django_bm25.routers.connections') as connections:
+            connections.__getitem__.return_value.in_atomic_block = False
+            response = SearchRouterMiddleware(read_view)(request)
+            SearchRouterMiddleware(read_view)(RequestFactory().get('/'))
+        self.assertEqual(seen, [True, False])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
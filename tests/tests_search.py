@@ -0,0 +1,81 @@
+from django_bm25.search import (
+    Boolean, Boost, Fuzzy, InvalidQuery, Phrase, Prefix, Range, Term, _compile, compile_query,
+)
+from . import Bm25TestCase, postgresql_only
+from .models import SearchModel
+
+
+class QueryBuilderTests(Bm25TestCase):
+    def test_term(self):
+        self.assertEqual(Term('title', 'rio').compile(), 'title:rio')
+        self.assertEqual(Term('title', 'a:b c').compile(), 'title:a\\:b\\ c')
+        self.assertEqual(Term('is_active', True).compile(), 'is_active:true')
+
+    def test_phrase_prefix_fuzzy(self):
+        self.assertEqual(Phrase('title', 'rio de janeiro').compile(), 'title:"rio de janeiro"')
+        self.assertEqual(Phrase('title', 'rio janeiro', slop=2).compile(), 'title:"rio janeiro"~2')
+        self.assertEqual(Prefix('title', 'jan').compile(), 'title:"jan"*')
+        self.assertEqual(Fuzzy('title', 'janiero', distance=2).compile(), 'title:janiero~2')
+        with self.assertRaises(InvalidQuery):
+            Fuzzy('title', 'rio', distance=3)
+
+    def test_range(self):
+        self.assertEqual(Range('rating', gte=3).compile(), 'rating:[3 TO *}')
+        self.assertEqual(Range('rating', gt=1, lte=5).compile(), 'rating:{1 TO 5]')
+        self.assertEqual(Range('rating', lt=5).compile(), 'rating:{* TO 5}')
+        with self.assertRaises(InvalidQuery):
+            Range('rating')
+        with self.assertRaises(InvalidQuery):
+            Range('rating', gt=1, gte=1)
+
+    def test_boolean_and_boost(self):
+        query = Boolean(
+            must=[Term('title', 'rio')],
+            should=[Boost(Phrase('title', 'rio de janeiro'), 2)],
+            must_not=[Term('is_active', False)],
+        )
+        self.assertEqual(
+            query.compile(),
+            '(+title:rio (title:"rio de janeiro")^2 -is_active:false)',
+        )
+        self.assertEqual(
+            (Term('title', 'a') & Term('title', 'b')).compile(), '(+title:a +title:b)'
+        )
+        self.assertEqual(
+            (Term('title', 'a') | Term('title', 'b')).compile(), '(title:a title:b)'
+        )
+        self.assertEqual((~Term('title', 'a')).compile(), '(-title:a)')
+
+    def test_nodes_are_hashable(self):
+        self.assertEqual(Term('title', 'rio'), Term('title', 'rio'))
+        self.assertEqual(
+            hash(Boolean(must=[Term('title', 'rio')])),
+            hash(Boolean(must=[Term('title', 'rio')])),
+        )
+        self.assertNotEqual(Term('title', 'rio'), Prefix('title', 'rio'))
+
+    def test_validate_against_index(self):
+        query = Term('title', 'rio') & Range('rating', gte=3)
+        self.assertEqual(
+            compile_query(query, SearchModel), '(+title:rio +rating:[3 TO *})'
+        )
+        with self.assertRaisesMessage(InvalidQuery, 'category is not a field'):
+            compile_query(Term('category', 'x'), SearchModel)
+        with self.assertRaisesMessage(InvalidQuery, 'Phrase queries are not supported'):
+            compile_query(Phrase('rating', '1 2'), SearchModel)
+        with self.assertRaises(InvalidQuery):
+            compile_query(Boost(Range('is_active', gte=1), 2), SearchModel)
+
+    def test_compile_cache(self):
+        _compile.cache_clear()
+        query = Term('title', 'rio') | Prefix('title', 'jan')
+        compile_query(query, SearchModel)
+        compile_query(Term('title', 'rio') | Prefix('title', 'jan'), SearchModel)
+        info = _compile.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    @postgresql_only
+    def test_search_accepts_query(self):
+        queryset = SearchModel.search(Term('title', 'rio') & Range('rating', gte=3))
+        self.assertEqual(queryset._search_query, '(+title:rio +rating:[3 TO *})')
+        self.assertIn('@@@', str(queryset.query))
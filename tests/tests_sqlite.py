@@ -0,0 +1,152 @@
+import unittest
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.db import NotSupportedError, connection, models
+from django.test import TransactionTestCase
+from django_bm25.backends import SQLiteBackend, get_backend
+from django_bm25.loading import bulk_load
+from django_bm25.paginator import Bm25Paginator
+from . import SQLiteTestCase
+from .models import SearchModel
+
+class SQLiteBackendTests(SQLiteTestCase):
+    def setUp(self):
+        self.branco = SearchModel.objects.create(title="Rio Branco", category="AC", rating=3)
+        self.grande = SearchModel.objects.create(title="Rio Grande rio", category="RS", rating=5)
+        self.paulo = SearchModel.objects.create(title="Sao Paulo", category="SP", rating=5)
+
+    def test_backend(self):
+        self.assertIsInstance(get_backend(connection), SQLiteBackend)
+        self.assertFalse(get_backend(connection).supports_query_pushdown)
+
+    def test_search(self):
+        self.assertEqual(
+            list(SearchModel.search("title:rio", top_k=10)), [self.grande, self.branco]
+        )
+        self.assertEqual(list(SearchModel.search("title:nothing")), [])
+
+    def test_score(self):
+        first, second = SearchModel.search("title:rio", top_k=10)
+        self.assertGreater(first.score, second.score)
+        self.assertGreater(second.score, 0)
+
+    def test_triggers_keep_index_in_sync(self):
+        self.branco.title = "Porto Alegre"
+        self.branco.save()
+        self.paulo.delete()
+        SearchModel.objects.create(title="Rio Claro", category="SP")
+        self.assertEqual(
+            sorted(obj.title for obj in SearchModel.search("title:rio")),
+            ["Rio Claro", "Rio Grande rio"],
+        )
+        self.assertEqual(list(SearchModel.search("paulo")), [])
+        self.assertEqual(list(SearchModel.search("porto")), [self.branco])
+
+    def test_fts_query_runs_once(self):
+        sql = str(SearchModel.search("title:rio", top_k=10, min_score=0).query)
+        self.assertEqual(sql.count('MATCH'), 1)
+        self.assertIn('LEFT OUTER JOIN (SELECT rowid AS bm25_rowid, -bm25("idx_search_model")', sql)
+
+    def test_match_without_search_join(self):
+        from django_bm25.expressions import Bm25Match, Bm25Score
+
+        queryset = SearchModel.objects.filter(Bm25Match("title:rio")).annotate(score=Bm25Score())
+        self.assertEqual(sorted(obj.title for obj in queryset), ["Rio Branco", "Rio Grande rio"])
+
+    def test_postgresql_features_are_not_supported(self):
+        queryset = SearchModel.search("title:rio")
+        with self.assertRaises(NotSupportedError):
+            queryset.facets(["rating"])
+        with self.assertRaises(NotSupportedError):
+            queryset.estimated_count("planner")
+        with self.assertRaises(NotSupportedError):
+            SearchModel.search_many(["title:rio"])
+        with self.assertRaises(NotSupportedError):
+            SearchModel.search_hybrid("title:rio", [1.0], "title")
+        with self.assertRaises(NotSupportedError):
+            SearchModel._meta.indexes[0].stats(SearchModel)
+
+    def test_stats_command_is_not_supported(self):
+        with self.assertRaisesMessage(CommandError, "Index statistics is not supported on sqlite."):
+            call_command("bm25_stats", "tests.SearchModel")
+
+    def test_estimated_count_cached(self):
+        # The in-memory test database isn't shared with the refresh thread.
+        with mock.patch("django_bm25.cache.search_cache.refresh") as refresh:
+            count = SearchModel.search("title:rio").estimated_count("cached", cap=1)
+        self.assertEqual((count, count.exact), (1, False))
+        refresh.assert_called_once()
+
+    def test_estimated_count_sliced(self):
+        count = SearchModel.search("title:rio", top_k=1).estimated_count(cap=2)
+        self.assertEqual((count, count.exact), (1, True))
+        count = SearchModel.search("title:rio", top_k=5).estimated_count(cap=1)
+        self.assertEqual((count, count.exact), (1, False))
+
+    def test_filters_run_in_sql(self):
+        results = SearchModel.search("title:rio", filters={"rating__gte": 4})
+        self.assertEqual(results._search_query, "title:rio")
+        self.assertEqual(list(results), [self.grande])
+
+    def test_hits_and_hydrate(self):
+        queryset = SearchModel.search("title:rio", top_k=10)
+        hits = queryset.hits()
+        self.assertEqual([pk for pk, score in hits], [self.grande.pk, self.branco.pk])
+        self.assertEqual(queryset.hydrate(hits), [self.grande, self.branco])
+
+    def test_paginator(self):
+        paginator = Bm25Paginator(SearchModel.search("title:rio"), 1)
+        page = paginator.page(1)
+        self.assertEqual(list(page), [self.grande])
+        self.assertEqual(list(paginator.page(page.next_cursor)), [self.branco])
+
+    def test_collapse(self):
+        SearchModel.objects.create(title="Rio Pardo", category="RS")
+        results = SearchModel.search("title:rio", collapse_by="category", top_k=10)
+        self.assertEqual(sorted(obj.category for obj in results), ["AC", "RS"])
+
+    def test_collapse_cursor(self):
+        SearchModel.objects.create(title="Rio Pardo", category="RS")
+        paginator = Bm25Paginator(SearchModel.search("title:rio", collapse_by="category"), 1)
+        page = paginator.page(1)
+        self.assertEqual(list(page), [self.grande])
+        page = paginator.page(page.next_cursor)
+        self.assertEqual(list(page), [self.branco])
+        self.assertIsNone(page.next_cursor)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite specific tests")
+class SQLiteSchemaTests(TransactionTestCase):
+    available_apps = ["tests"]
+
+    def test_table_remake_keeps_index(self):
+        SearchModel.objects.create(title="Rio Branco", category="AC")
+        field = models.IntegerField(default=0)
+        field.set_attributes_from_name("population")
+        field.model = SearchModel
+        with connection.schema_editor() as editor:
+            editor.add_field(SearchModel, field)
+        try:
+            self.assertEqual(SearchModel.search("title:rio").count(), 1)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT DISTINCT tbl_name FROM sqlite_master WHERE name LIKE 'idx_search_model_a%%'"
+                )
+                self.assertEqual(cursor.fetchall(), [("tests_searchmodel",)])
+        finally:
+            with connection.schema_editor() as editor:
+                editor.remove_field(SearchModel, field)
+        SearchModel.objects.create(title="Rio Grande", category="RS")
+        self.assertEqual(SearchModel.search("title:rio").count(), 2)
+
+    def test_bulk_load_rebuilds_index(self):
+        SearchModel.objects.create(title="Rio Branco", category="AC")
+        result = bulk_load(
+            SearchModel,
+            [{"title": "Rio Grande", "category": "RS", "rating": "4", "is_active": "f"}],
+            drop_index=True,
+        )
+        self.assertEqual(result["rows"], 1)
+        self.assertEqual(SearchModel.search("title:rio").count(), 2)
+        grande = SearchModel.objects.get(category="RS")
+        self.assertEqual((grande.rating, grande.is_active), (4, False))
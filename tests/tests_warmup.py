@@ -0,0 +1,67 @@
+from unittest import mock
+from django.apps import apps
+from django.test import override_settings
+from django_bm25.apps import is_server_process
+from django_bm25.warmup import get_warmup_queries, replay, warmup_index
+from . import Bm25TestCase
+from .models import SearchModel
+
+class WarmupTests(Bm25TestCase):
+    def get_index(self):
+        return SearchModel._meta.indexes[0]
+
+    @override_settings(BM25_WARMUP_QUERIES={'tests.SearchModel': ['title:rio', 'title:sao']})
+    def test_configured_queries(self):
+        self.assertEqual(
+            get_warmup_queries(SearchModel, self.get_index(), count=1),
+            ['title:rio'],
+        )
+
+    def test_queries_from_table(self):
+        SearchModel.objects.create(title='Rio Branco', category='AC')
+        SearchModel.objects.create(title='Rio Grande', category='RS')
+        queries = get_warmup_queries(SearchModel, self.get_index())
+        self.assertEqual(queries[0], 'title:rio')
+        self.assertEqual(len(queries), 3)
+
+    def test_queries_are_escaped(self):
+        SearchModel.objects.create(title='C++ (rio)', category='AC')
+        self.assertEqual(
+            sorted(get_warmup_queries(SearchModel, self.get_index())),
+            ['title:\\(rio\\)', 'title:c\\+\\+'],
+        )
+
+    def test_replay_uses_database(self):
+        with mock.patch.object(SearchModel, 'search') as search:
+            self.assertEqual(replay(SearchModel, ['title:rio'], using='other'), 1)
+        search.assert_called_once_with('title:rio', top_k=10, using='other')
+
+    def test_warmup_index(self):
+        SearchModel.objects.create(title='Rio Branco', category='AC')
+        result = warmup_index(SearchModel, self.get_index())
+        self.assertIn(result['method'], ['pg_prewarm', 'replay'])
+        self.assertEqual(result['index'], 'idx_search_model')
+        self.assertGreaterEqual(result['seconds'], 0)
+
+    def test_is_server_process(self):
+        self.assertTrue(is_server_process(['/venv/bin/gunicorn', 'example.wsgi']))
+        self.assertFalse(is_server_process(['manage.py', 'migrate']))
+        self.assertFalse(is_server_process(['/venv/bin/django-admin', 'shell']))
+        self.assertFalse(is_server_process(['/venv/lib/django/__main__.py', 'test']))
+        self.assertTrue(is_server_process(['manage.py', 'runserver', '--noreload']))
+        with mock.patch.dict('os.environ', {'RUN_MAIN': 'true'}):
+            self.assertTrue(is_server_process(['manage.py', 'runserver']))
+        with mock.patch.dict('os.environ', {'RUN_MAIN': ''}):
+            # The autoreloader's parent process doesn't serve requests.
+            self.assertFalse(is_server_process(['manage.py', 'runserver']))
+
+    @override_settings(BM25_WARMUP_ON_STARTUP=True)
+    def test_warmup_on_startup_only_in_server_processes(self):
+        config = apps.get_app_config('django_bm25')
+        with mock.patch.object(config, 'start_warmup') as start_warmup:
+            with mock.patch('sys.argv', ['manage.py', 'migrate']):
+                config.ready()
+            start_warmup.assert_not_called()
+            with mock.patch('sys.argv', ['/venv/bin/gunicorn', 'example.wsgi']):
+                config.ready()
+            start_warmup.assert_called_once_with()